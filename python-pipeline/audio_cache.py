@@ -0,0 +1,55 @@
+"""
+Cache del audio decodificado de un video (mono 16kHz float32, lo que usan Whisper y el VAD)
+El .npy solo se reutiliza si su archivo de metadata coincide exactamente con el
+tamaño y el mtime (en ns) del video de origen
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+def _source_key(video_file):
+    """Identifica la versión del video por tamaño y mtime exactos"""
+    stat = os.stat(video_file)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _replace_atomic(path, write):
+    """Escribe en un archivo temporal y lo mueve sobre path"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def load_audio_cached(video_file, cache_path, decode):
+    """
+    Devuelve el audio del video como array float32 mono 16kHz
+    decode(video_file) solo se llama si el cache no corresponde a este mismo video
+    """
+    cache_path = Path(cache_path)
+    source_path = cache_path.with_name(cache_path.name + ".source.json")
+    source_key = _source_key(video_file)
+
+    try:
+        with open(source_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == source_key:
+                audio = np.load(cache_path)
+                print(f">> Usando audio ya decodificado: {cache_path.name}")
+                return audio
+    except (OSError, ValueError):
+        pass  # No hay cache válido todavía
+
+    print(">> Decodificando audio (mono 16kHz)...")
+    audio = decode(video_file)
+
+    # Se invalida la metadata antes de reemplazar el .npy: si el proceso se corta
+    # a mitad de camino, nunca queda un audio asociado al video equivocado
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    source_path.unlink(missing_ok=True)
+    _replace_atomic(cache_path, lambda f: np.save(f, audio))
+    _replace_atomic(source_path, lambda f: f.write(json.dumps(source_key).encode('utf-8')))
+    return audio
@@ -4,6 +4,7 @@ Fusiona todas las configuraciones de las etapas 2-7 del pipeline
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # ===== CONFIGURACIÓN DE RUTAS BASE =====
@@ -35,6 +36,13 @@ class ContentGenerationConfig:
     # Rutas de material listo para producción
     RELEASE_MATERIAL_DIR = CONTENT_GENERATION_DIR / "05_release_material"
     
+    # Caché de scripts ya generados (evita repetir llamadas al modelo con los mismos parámetros)
+    # Un JSON por clave escrito de forma atómica, seguro con varios procesos a la vez
+    SCRIPT_CACHE_DIR = CONTENT_GENERATION_DIR / ".cache" / "scripts"
+    
+    # Caché de análisis de scripts (un JSON por hash de modelo + prompt del sistema + script)
+    ANALYSIS_CACHE_DIR = CONTENT_GENERATION_DIR / ".cache" / "analyzer"
+    
     # Configuración de generación
     DEFAULT_MIN_DURATION = 15
     DEFAULT_MAX_DURATION = 20
@@ -46,19 +54,38 @@ class TranscriptionConfig:
     # Rutas
     VIDEO_INPUT_PATH = VIDEO_RECORDING_DIR / "recorded_video.mp4"
     OUTPUT_DIRECTORY = VIDEO_PROCESSING_DIR / "01_transcription"
+    # Audio decodificado (mono 16kHz float32) reutilizable por otras etapas
+    AUDIO_CACHE_PATH = VIDEO_PROCESSING_DIR / "01_transcription" / "audio_16k.npy"
     
     # Configuración de Whisper
     WHISPER_MODEL = "large-v3"
     FALLBACK_MODEL = "base"
     LANGUAGE = "en"
     
+    # Backend: "faster-whisper" (CTranslate2 con pesos INT8, varias veces más rápido)
+    # u "openai-whisper". Si faster-whisper no está instalado se usa openai-whisper
+    WHISPER_BACKEND = "faster-whisper"
+    VAD_FILTER = True  # Solo faster-whisper: descarta los silencios antes de decodificar
+    BATCH_SIZE = 8  # Solo faster-whisper con VAD_FILTER: tramos de voz decodificados en paralelo (0 = secuencial)
+    
+    # Carpeta de los pesos del modelo (None = caché por defecto de cada librería, p. ej. ~/.cache/whisper)
+    # Apuntarla a un disco rápido o a /dev/shm evita releer 1-3GB de disco lento en cada ejecución
+    MODEL_CACHE_DIR = os.getenv("WHISPER_CACHE_DIR")
+    
     # Configuración avanzada
+    # Timestamps por palabra (alineación DTW, ~25-35% más de tiempo de transcripción).
+    # Solo se calculan si algo los usa: el JSON detallado o WORD_ALIGNED_SRT.
+    # Con WORD_ALIGNED_SRT los tiempos del SRT se ajustan a la primera/última palabra
+    # (cortes de silencio más precisos); sin él se usan los tiempos de segmento de Whisper
     WORD_TIMESTAMPS = True
+    WORD_ALIGNED_SRT = False
     TEMPERATURE = 0
     BEST_OF = 5
     BEAM_SIZE = 5
     
-    # Archivos de salida
+    # Archivos de salida: las etapas siguientes solo leen el SRT.
+    # TXT y JSON son opcionales (solo para consulta); el JSON además activa
+    # los timestamps por palabra si WORD_TIMESTAMPS está habilitado
     GENERATE_TXT = False
     GENERATE_JSON = False
     GENERATE_SRT = True
@@ -79,12 +106,25 @@ class SilenceCutConfig:
     BUFFER_BEFORE = 0.1
     BUFFER_AFTER = 0.1
     
+    # Detección de voz directa sobre el audio (Silero VAD incluido en faster-whisper)
+    # en lugar de usar los huecos del SRT. Reutiliza el audio decodificado por la transcripción
+    USE_VAD = False
+    VAD_THRESHOLD = 0.5
+    AUDIO_CACHE_PATH = TranscriptionConfig.AUDIO_CACHE_PATH
+    
     # Configuración de video
     CRF_VALUE = 20
     PRESET = "medium"
     VIDEO_CODEC = "libx264"
     AUDIO_CODEC = "aac"
     
+    # Método de corte:
+    #   "copy"     -> ffmpeg con stream copy (sin re-codificar, cortes alineados a keyframes:
+    #                 los silencios más cortos que un GOP no se cortan)
+    #   "reencode" -> ffmpeg re-codificando cada segmento (cortes exactos al frame)
+    #   "moviepy"  -> método original con MoviePy (re-codifica todo el video)
+    CUT_METHOD = "copy"
+    
     # Logging
     VERBOSE = True
     MOVIEPY_VERBOSE = True
@@ -98,6 +138,7 @@ class SubtitlesConfig:
     # Configuración de Whisper (igual que transcripción)
     WHISPER_MODEL = "large-v3"
     FALLBACK_MODEL = "base"
+    MODEL_CACHE_DIR = TranscriptionConfig.MODEL_CACHE_DIR
     LANGUAGE = "en"
     WORD_TIMESTAMPS = True
     TEMPERATURE = 0
@@ -186,12 +227,43 @@ class VideoGenerationConfig:
     PARALLEL_PROCESSING = True
     MAX_RETRIES = 3
 
+# ===== RUTAS COMO TEXTO =====
+def _freeze_paths():
+    """Añade a cada clase de configuración un atributo *_STR con la ruta resuelta como str por cada atributo Path"""
+    for cls in (ContentGenerationConfig, TranscriptionConfig, SilenceCutConfig, SubtitlesConfig,
+                SynchronizationConfig, SegmentedPromptsConfig, VideoGenerationConfig):
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, Path):
+                setattr(cls, name + "_STR", str(value.resolve(strict=False)))
+
+_freeze_paths()
+
+# ===== RUTAS RESUELTAS =====
+# Rutas absolutas precalculadas una sola vez al importar (evita repetir resolve())
+_RESOLVED = {name: path.resolve() for name, path in [
+    ("VIDEO_PRODUCTION_DIR", VIDEO_PRODUCTION_DIR),
+    ("CONTENT_GENERATION_DIR", CONTENT_GENERATION_DIR),
+    ("VIDEO_RECORDING_DIR", VIDEO_RECORDING_DIR),
+    ("VIDEO_PROCESSING_DIR", VIDEO_PROCESSING_DIR),
+    ("VIDEO_GENERATION_DIR", VIDEO_GENERATION_DIR),
+    ("TRANSCRIPTION_OUTPUT_DIR", TranscriptionConfig.OUTPUT_DIRECTORY),
+    ("SILENCE_CUT_OUTPUT_DIR", SilenceCutConfig.OUTPUT_DIRECTORY),
+    ("SUBTITLES_OUTPUT_DIR", SubtitlesConfig.OUTPUT_DIRECTORY),
+    ("SYNCHRONIZATION_OUTPUT_DIR", SynchronizationConfig.OUTPUT_DIRECTORY),
+    ("SEGMENTED_PROMPTS_OUTPUT_DIR", SegmentedPromptsConfig.OUTPUT_DIR),
+    ("VIDEO_GENERATION_OUTPUT_DIR", VideoGenerationConfig.OUTPUT_DIR),
+    ("VIDEO_GENERATION_METADATA_DIR", VideoGenerationConfig.METADATA_DIR),
+]}
+
 # ===== FUNCIONES DE UTILIDAD =====
 def get_absolute_path(path):
-    """Convierte cualquier path a absoluto"""
-    if isinstance(path, str):
-        path = Path(path)
-    return path.resolve()
+    """Convierte cualquier path a absoluto (cacheado por ruta)"""
+    return _resolve_path(str(Path(path)))
+
+@lru_cache(maxsize=256)
+def _resolve_path(path_str):
+    """Resuelve una ruta normalizada; el resultado se reutiliza en llamadas posteriores"""
+    return Path(path_str).resolve()
 
 def ensure_directory_exists(directory):
     """Crea un directorio si no existe"""
@@ -206,46 +278,67 @@ def validate_file_exists(file_path):
         raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
     return True
 
-def validate_all_paths():
-    """Valida que todas las rutas críticas existen o se pueden crear"""
+# Directorios de la última validación exitosa (evita repetir los stat/mkdir en el mismo proceso)
+_LAST_VALIDATION = None
+
+def validate_all_paths(force=False):
+    """
+    Valida que todas las rutas críticas existen o se pueden crear
+    Si ya se validaron con éxito las mismas rutas en este proceso, no se repite (force=True lo obliga)
+    """
+    global _LAST_VALIDATION
+    
+    validation_key = tuple(str(path) for path in _RESOLVED.values())
+    if not force and _LAST_VALIDATION == validation_key:
+        return []
+    
     errors = []
     
     # Validar directorio base de producción de video
-    if not VIDEO_PRODUCTION_DIR.exists():
-        errors.append(f"Directorio base de producción no existe: {VIDEO_PRODUCTION_DIR}")
+    if not _RESOLVED["VIDEO_PRODUCTION_DIR"].exists():
+        errors.append(f"Directorio base de producción no existe: {_RESOLVED['VIDEO_PRODUCTION_DIR']}")
     
     # Crear directorios de salida si no existen
-    directories_to_create = [
-        CONTENT_GENERATION_DIR,
-        VIDEO_RECORDING_DIR,
-        VIDEO_PROCESSING_DIR,
-        VIDEO_GENERATION_DIR,
-        TranscriptionConfig.OUTPUT_DIRECTORY,
-        SilenceCutConfig.OUTPUT_DIRECTORY,
-        SubtitlesConfig.OUTPUT_DIRECTORY,
-        SynchronizationConfig.OUTPUT_DIRECTORY,
-        SegmentedPromptsConfig.OUTPUT_DIR,
-        VideoGenerationConfig.OUTPUT_DIR,
-        VideoGenerationConfig.METADATA_DIR
-    ]
-    
-    for directory in directories_to_create:
+    directories_to_create = [path for name, path in _RESOLVED.items() if name != "VIDEO_PRODUCTION_DIR"]
+    
+    # Un solo scandir por carpeta padre; mkdir solo para las que faltan.
+    # Se procesan de menor a mayor profundidad para crear los padres primero.
+    existing_children = {}
+    for directory in sorted(directories_to_create, key=lambda d: len(d.parts)):
         try:
-            ensure_directory_exists(directory)
+            parent = directory.parent
+            if parent not in existing_children:
+                try:
+                    with os.scandir(parent) as entries:
+                        existing_children[parent] = {entry.name for entry in entries if entry.is_dir()}
+                except FileNotFoundError:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    existing_children[parent] = set()
+            
+            if directory.name in existing_children[parent]:
+                continue
+            
+            try:
+                os.mkdir(directory)
+                existing_children[directory] = set()
+            except FileExistsError:
+                pass
+            existing_children[parent].add(directory.name)
         except Exception as e:
             errors.append(f"No se pudo crear directorio {directory}: {e}")
     
+    _LAST_VALIDATION = None if errors else validation_key
     return errors
 
 def print_configuration_summary():
     """Imprime un resumen de la configuración actual"""
     print(">> CONFIGURACIÓN DEL PIPELINE DE PRODUCCIÓN DE VIDEO")
     print("=" * 60)
-    print(f">> Directorio de producción: {VIDEO_PRODUCTION_DIR}")
-    print(f">> Generación de contenido: {CONTENT_GENERATION_DIR}")
-    print(f">> Grabación de video: {VIDEO_RECORDING_DIR}")
-    print(f">> Procesamiento de video: {VIDEO_PROCESSING_DIR}")
-    print(f">> Generación de video AI: {VIDEO_GENERATION_DIR}")
+    print(f">> Directorio de producción: {_RESOLVED['VIDEO_PRODUCTION_DIR']}")
+    print(f">> Generación de contenido: {_RESOLVED['CONTENT_GENERATION_DIR']}")
+    print(f">> Grabación de video: {_RESOLVED['VIDEO_RECORDING_DIR']}")
+    print(f">> Procesamiento de video: {_RESOLVED['VIDEO_PROCESSING_DIR']}")
+    print(f">> Generación de video AI: {_RESOLVED['VIDEO_GENERATION_DIR']}")
     print(f"\n>> Modelo Whisper: {TranscriptionConfig.WHISPER_MODEL}")
     print(f">> Codec de video: {SilenceCutConfig.VIDEO_CODEC}")
     print(f">> Modelo AI: {SegmentedPromptsConfig.MODEL_NAME}")
@@ -253,6 +346,28 @@ def print_configuration_summary():
     print("=" * 60)
 
 # ===== PERFILES PREDEFINIDOS =====
+# Cada perfil es una lista de (clase, atributo, valor) y el mensaje que se muestra al aplicarlo
+_PROFILES = {
+    "fast": ([
+        (TranscriptionConfig, "WHISPER_MODEL", "base"),
+        (SubtitlesConfig, "WHISPER_MODEL", "base"),
+        (TranscriptionConfig, "BEST_OF", 1),
+        (SilenceCutConfig, "CRF_VALUE", 28),
+    ], "RÁPIDO"),
+    "balanced": ([
+        (TranscriptionConfig, "WHISPER_MODEL", "medium"),
+        (SubtitlesConfig, "WHISPER_MODEL", "medium"),
+        (TranscriptionConfig, "BEST_OF", 3),
+        (SilenceCutConfig, "CRF_VALUE", 23),
+    ], "BALANCEADO"),
+    "high": ([
+        (TranscriptionConfig, "WHISPER_MODEL", "large-v3"),
+        (SubtitlesConfig, "WHISPER_MODEL", "large-v3"),
+        (TranscriptionConfig, "BEST_OF", 5),
+        (SilenceCutConfig, "CRF_VALUE", 20),
+    ], "ALTA CALIDAD"),
+}
+
 def apply_quality_profile(profile="high"):
     """
     Aplica perfiles de calidad predefinidos a todo el pipeline
@@ -262,29 +377,14 @@ def apply_quality_profile(profile="high"):
     - 'balanced': Balance entre velocidad y calidad  
     - 'high': Máxima calidad (recomendado)
     """
-    if profile == "fast":
-        TranscriptionConfig.WHISPER_MODEL = "base"
-        SubtitlesConfig.WHISPER_MODEL = "base"
-        TranscriptionConfig.BEST_OF = 1
-        SilenceCutConfig.CRF_VALUE = 28
-        print(">> Perfil aplicado: RÁPIDO")
-        
-    elif profile == "balanced":
-        TranscriptionConfig.WHISPER_MODEL = "medium"
-        SubtitlesConfig.WHISPER_MODEL = "medium"
-        TranscriptionConfig.BEST_OF = 3
-        SilenceCutConfig.CRF_VALUE = 23
-        print(">> Perfil aplicado: BALANCEADO")
-        
-    elif profile == "high":
-        TranscriptionConfig.WHISPER_MODEL = "large-v3"
-        SubtitlesConfig.WHISPER_MODEL = "large-v3"
-        TranscriptionConfig.BEST_OF = 5
-        SilenceCutConfig.CRF_VALUE = 20
-        print(">> Perfil aplicado: ALTA CALIDAD")
-        
-    else:
+    if profile not in _PROFILES:
         print(f"WARNING: Perfil '{profile}' no reconocido. Usando configuración actual.")
+        return
+    
+    settings, label = _PROFILES[profile]
+    for cls, attr, value in settings:
+        setattr(cls, attr, value)
+    print(f">> Perfil aplicado: {label}")
 
 if __name__ == "__main__":
     # Mostrar configuración
@@ -0,0 +1,11 @@
+"""
+Acceso diferido a config.py
+El módulo config (rutas, clases de configuración, validación) se importa recién
+al leer el primer atributo, p. ej. config_lazy.ContentGenerationConfig
+Usar `import config_lazy`: un `from config_lazy import X` dispara la carga de inmediato
+"""
+
+
+def __getattr__(name):
+    import config as _config
+    return getattr(_config, name)
@@ -1,15 +1,51 @@
 from pydantic import BaseModel
-from pydantic_ai import Agent
-from dotenv import load_dotenv
 import os
-import json
 import argparse
+import asyncio
+import hashlib
+import logging
 import sys
 import re
-from config import ContentGenerationConfig
+from collections import Counter, defaultdict
+from functools import lru_cache
+import config_lazy as config
+from json_utils import load_json, dump_json, dump_json_if_changed, dumps_json, write_atomic
 
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Output directories already created in this process
+_ENSURED_DIRS: set = set()
+
+# Agents built in this process, keyed by (model, category, system prompt hash)
+_AGENTS: dict = {}
+
+
+# User message sent to the scriptwriter agent (kept free of indentation whitespace to save prompt tokens)
+_USER_MSG_TMPL = (
+    "Create a video script with the following specifications:\n"
+    "- Topic: {topic}\n"
+    "- Duration: between {mn} and {mx} seconds\n"
+    "- Category: {cat}\n"
+    "Please follow the framework outlined in the system prompt and provide the script in the required format."
+)
+
+
+# System prompt used when the category prompts file cannot be loaded
+_DEFAULT_PROMPT = "You are an expert AI video scriptwriter creating engaging content for Spanish learners."
+
+
+def _bootstrap():
+    """Load environment variables (API keys) from .env before talking to the model provider"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _ensure_once(path: str):
+    """Create a directory (and its parents) the first time it is needed in this process"""
+    if path in _ENSURED_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ENSURED_DIRS.add(path)
 
 
 def remove_emojis(text: str) -> str:
@@ -58,46 +94,67 @@ class ScriptVideo(BaseModel):
     closing: str
 
 
+@lru_cache(maxsize=4)
+def _load_prompts_raw(prompts_file: str, mtime: float) -> dict:
+    """Read and parse the prompts JSON file (cached per path and modification time)"""
+    return load_json(prompts_file)
+
+
+class _CategoryPrompts(dict):
+    """Category -> prompt mapping whose missing keys resolve to the fallback prompt (without inserting them)"""
+    
+    def __init__(self, prompts: dict):
+        super().__init__(prompts)
+        self.fallback = self.get("Quick Travel Phrases", self.get("default", ""))
+    
+    def __missing__(self, category):
+        return self.fallback
+
+
+@lru_cache(maxsize=4)
+def _build_category_prompts(prompts_file: str, mtime: float) -> dict:
+    """Join each category's prompt array into a single string (cached like _load_prompts_raw)"""
+    category_prompts = {}
+    for category, data in _load_prompts_raw(prompts_file, mtime).items():
+        prompt_data = data.get('prompt', [])
+        if isinstance(prompt_data, list):
+            # Join array elements with newlines
+            category_prompts[category] = '\n'.join(prompt_data)
+        else:
+            # Handle old string format as fallback
+            category_prompts[category] = prompt_data
+    return _CategoryPrompts(category_prompts)
+
+
 def load_category_prompts(prompts_file: str = None) -> dict:
     """Load category prompts from JSON file"""
     if prompts_file is None:
-        prompts_file = str(ContentGenerationConfig.CATEGORY_PROMPTS_FILE)
+        prompts_file = config.ContentGenerationConfig.CATEGORY_PROMPTS_FILE_STR
     
     try:
-        with open(prompts_file, 'r', encoding='utf-8') as f:
-            prompts_data = json.load(f)
+        prompts_file = os.path.abspath(prompts_file)
+        category_prompts = _build_category_prompts(prompts_file, os.path.getmtime(prompts_file))
         
-        # Extract and join prompt arrays into strings for each category
-        category_prompts = {}
-        for category, data in prompts_data.items():
-            prompt_data = data.get('prompt', [])
-            if isinstance(prompt_data, list):
-                # Join array elements with newlines
-                category_prompts[category] = '\n'.join(prompt_data)
-            else:
-                # Handle old string format as fallback
-                category_prompts[category] = prompt_data
-        
-        print(f"[OK] Loaded {len(category_prompts)} category prompts from {prompts_file}")
+        logger.info("[OK] Loaded %s category prompts from %s", len(category_prompts), prompts_file)
         return category_prompts
         
     except FileNotFoundError:
-        print(f"[ERROR] Prompts file not found: {prompts_file}")
-        print("Using default fallback prompt...")
-        return {"default": "You are an expert AI video scriptwriter creating engaging content for Spanish learners."}
+        logger.error("[ERROR] Prompts file not found: %s", prompts_file)
+        logger.info("Using default fallback prompt...")
+        return _CategoryPrompts({"default": _DEFAULT_PROMPT})
     except Exception as e:
-        print(f"[ERROR] Error loading prompts: {str(e)}")
-        return {"default": "You are an expert AI video scriptwriter creating engaging content for Spanish learners."}
+        logger.error("[ERROR] Error loading prompts: %s", e)
+        return _CategoryPrompts({"default": _DEFAULT_PROMPT})
 
 
 def show_available_categories(prompts_file: str = None):
     """Show available categories and their descriptions"""
     if prompts_file is None:
-        prompts_file = str(ContentGenerationConfig.CATEGORY_PROMPTS_FILE)
+        prompts_file = config.ContentGenerationConfig.CATEGORY_PROMPTS_FILE_STR
     
     try:
-        with open(prompts_file, 'r', encoding='utf-8') as f:
-            prompts_data = json.load(f)
+        prompts_file = os.path.abspath(prompts_file)
+        prompts_data = _load_prompts_raw(prompts_file, os.path.getmtime(prompts_file))
         
         print(f"\n📋 Available Categories ({len(prompts_data)}):")
         print("=" * 50)
@@ -118,24 +175,69 @@ def show_available_categories(prompts_file: str = None):
 
 def get_system_prompt(category: str, category_prompts: dict) -> str:
     """Get the appropriate system prompt for a given category"""
+    if isinstance(category_prompts, _CategoryPrompts):
+        # Fallback already resolved when the prompts were loaded
+        return category_prompts[category]
     return category_prompts.get(category, category_prompts.get("Quick Travel Phrases", category_prompts.get("default", "")))
 
 
+def _hash_prompt(system_prompt: str) -> str:
+    """Return a stable hash of a system prompt, used to invalidate cached scripts when prompts change"""
+    return hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()
+
+
+def _script_cache_key(model_name: str, category: str, topic: str, min_duration: int, max_duration: int, prompt_hash: str) -> str:
+    """Build the script cache key for one generation request"""
+    return hashlib.sha256(
+        f"{model_name}|{category}|{topic}|{min_duration}|{max_duration}|{prompt_hash}".encode('utf-8')
+    ).hexdigest()
+
+
+def _script_cache_file(cache_key: str) -> str:
+    """Cache file of one generated script (one JSON per key, so concurrent processes never share a file)"""
+    return os.path.join(config.ContentGenerationConfig.SCRIPT_CACHE_DIR_STR, f"{cache_key}.json")
+
+
+def _load_cached_script(cache_key: str, use_cache: bool = True):
+    """Return the cached script for a key, or None if caching is disabled or there is no valid entry"""
+    if not use_cache:
+        return None
+    try:
+        return load_json(_script_cache_file(cache_key))
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_script(cache_key: str, script: dict, use_cache: bool = True):
+    """Store a generated script in the cache (atomic write, safe across processes)"""
+    if not use_cache:
+        return
+    _ensure_once(config.ContentGenerationConfig.SCRIPT_CACHE_DIR_STR)
+    write_atomic(_script_cache_file(cache_key), dumps_json(script))
+
+
 def create_scriptwriter_agent(model_name: str, category: str = "Quick Travel Phrases", category_prompts: dict = None):
     """Create and return a scriptwriter agent with the specified model and category-specific prompt"""
+    from pydantic_ai import Agent
+    
     if category_prompts is None:
         category_prompts = load_category_prompts()
     
     system_prompt = get_system_prompt(category, category_prompts)
     
-    return Agent(
-        model=model_name,
-        output_type=ScriptVideo,
-        system_prompt=system_prompt
-    )
+    key = (model_name, category, _hash_prompt(system_prompt))
+    agent = _AGENTS.get(key)
+    if agent is None:
+        agent = _AGENTS[key] = Agent(
+            model=model_name,
+            output_type=ScriptVideo,
+            system_prompt=system_prompt
+        )
+    return agent
 
 
-def process_single_topic(file_path: str, topic_id: int, model_name: str, output_json: str = None, min_duration: int = 15, max_duration: int = 20):
+def process_single_topic(file_path: str, topic_id: int, model_name: str, output_json: str = None, min_duration: int = 15, max_duration: int = 20,
+                         use_cache: bool = True):
     """
     Process a single topic by ID and generate script
     
@@ -146,23 +248,25 @@ def process_single_topic(file_path: str, topic_id: int, model_name: str, output_
         output_json: Output JSON file path
         min_duration: Minimum video duration in seconds
         max_duration: Maximum video duration in seconds
+        use_cache: Reuse a previously generated script for identical inputs
     """
+    _bootstrap()
+    
     try:
         # Load category prompts first
-        print("Loading category prompts...")
+        logger.info("Loading category prompts...")
         category_prompts = load_category_prompts()
         
         # Read the JSON file
-        print(f"Reading JSON file: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            topics_data = json.load(f)
+        logger.info("Reading JSON file: %s", file_path)
+        topics_data = load_json(file_path)
         
         # Check if data is valid
         if not isinstance(topics_data, list):
             raise ValueError("JSON file should contain a list of topic objects")
         
         # Find the specific topic by ID
-        print(f">> Searching for topic with ID: {topic_id}")
+        logger.info(">> Searching for topic with ID: %s", topic_id)
         target_topic = None
         for item in topics_data:
             if item.get('id') == topic_id:
@@ -170,23 +274,23 @@ def process_single_topic(file_path: str, topic_id: int, model_name: str, output_
                 break
         
         if target_topic is None:
-            print(f"[ERROR] Topic with ID {topic_id} not found!")
-            print(f"Available IDs: {[item.get('id') for item in topics_data if item.get('id')]}")
+            logger.error("[ERROR] Topic with ID %s not found!", topic_id)
+            logger.info("Available IDs: %s", [item.get('id') for item in topics_data if item.get('id')])
             return None
         
         # Validate topic has required fields
         if not target_topic.get('Topics'):
-            print(f"[ERROR] Topic {topic_id} has no content!")
+            logger.error("[ERROR] Topic %s has no content!", topic_id)
             return None
         
         topic_text = target_topic.get('Topics', '')
         category = target_topic.get('Category', 'Unknown')
         
-        print(f"[OK] Found topic {topic_id}: {topic_text}")
-        print(f">> Category: {category}")
+        logger.info("[OK] Found topic %s: %s", topic_id, topic_text)
+        logger.info(">> Category: %s", category)
         
         # Create agent for this category
-        print(f"Creating agent for category: {category}")
+        logger.info("Creating agent for category: %s", category)
         agent = create_scriptwriter_agent(model_name, category, category_prompts)
         
         # Create parameters for the agent
@@ -197,86 +301,273 @@ def process_single_topic(file_path: str, topic_id: int, model_name: str, output_
         )
         
         # Create a specific user message
-        user_message = f"""
-        Create a video script with the following specifications:
-        - Topic: {parameters.topic}
-        - Duration: between {parameters.min_duration} and {parameters.max_duration} seconds
-        - Category: {category}
-        
-        Please follow the framework outlined in the system prompt and provide the script in the required format.
-        """
+        user_message = _USER_MSG_TMPL.format(
+            topic=parameters.topic, mn=parameters.min_duration, mx=parameters.max_duration, cat=category
+        )
         
-        print(f">> Generating script for topic {topic_id}...")
+        cache_key = _script_cache_key(model_name, category, parameters.topic, min_duration, max_duration,
+                                      _hash_prompt(get_system_prompt(category, category_prompts)))
         
-        # Generate script using the category-specific agent
-        result = agent.run_sync(user_message)
+        script = _load_cached_script(cache_key, use_cache)
+        if script is not None:
+            logger.info("[OK] Using cached script for topic %s", topic_id)
+        else:
+            logger.info(">> Generating script for topic %s...", topic_id)
+            
+            # Generate script using the category-specific agent
+            result = agent.run_sync(user_message)
+            
+            # Remove emojis to avoid encoding issues
+            script = {
+                "hook": remove_emojis(result.output.hook),
+                "development": remove_emojis(result.output.development),
+                "closing": remove_emojis(result.output.closing)
+            }
+            _store_cached_script(cache_key, script, use_cache)
         
-        # Create JSON entry (remove emojis to avoid encoding issues)
+        # Create JSON entry
         script_entry = {
             "id": topic_id,
             "category": category,
             "topic": topic_text,
-            "script": {
-                "hook": remove_emojis(result.output.hook),
-                "development": remove_emojis(result.output.development),
-                "closing": remove_emojis(result.output.closing)
-            }
+            "script": script
         }
         
         # Set output path with ID
         if output_json is None:
-            base_dir = os.path.dirname(str(ContentGenerationConfig.GENERATED_SCRIPTS_FILE))
+            base_dir = os.path.dirname(config.ContentGenerationConfig.GENERATED_SCRIPTS_FILE_STR)
             output_json = os.path.join(base_dir, f"script_id_{topic_id}.json")
         
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_json), exist_ok=True)
+        _ensure_once(os.path.dirname(output_json))
         
         # Save single script result
-        with open(output_json, 'w', encoding='utf-8') as f:
-            json.dump(script_entry, f, indent=2, ensure_ascii=False)
+        dump_json(script_entry, output_json)
         
-        print(f"[OK] Script generated successfully!")
-        print(f">> Saved to: {output_json}")
-        print(f">> Topic: {topic_text}")
-        print(f">> Category: {category}")
+        logger.info("[OK] Script generated successfully!")
+        logger.info(">> Saved to: %s", output_json)
+        logger.info(">> Topic: %s", topic_text)
+        logger.info(">> Category: %s", category)
         
         return script_entry
         
     except Exception as e:
-        print(f"[ERROR] Error processing topic {topic_id}: {str(e)}")
+        logger.error("[ERROR] Error processing topic %s: %s", topic_id, e)
         raise
 
 
+def _retry_after_seconds(error: Exception):
+    """Extract the Retry-After delay (in seconds) from a rate-limit error, if present"""
+    for candidate in (error, error.__cause__):
+        response = getattr(candidate, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers and headers.get('retry-after'):
+            try:
+                return float(headers['retry-after'])
+            except ValueError:
+                return None
+    return None
+
+
+async def run_agent_with_retry(agent, user_message: str, max_retries: int = 3):
+    """
+    Run an agent call, backing off and retrying when the provider rate-limits us (HTTP 429)
+
+    Args:
+        agent: The scriptwriter agent to run
+        user_message: The user message to send
+        max_retries: Maximum number of retries on rate-limit errors
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await agent.run(user_message)
+        except Exception as e:
+            if getattr(e, 'status_code', None) != 429 or attempt == max_retries:
+                raise
+            delay = _retry_after_seconds(e) or 2 ** attempt
+            logger.warning("[WARNING] Rate limited, retrying in %.1fs...", delay)
+            await asyncio.sleep(delay)
+
+
+def process_topics_by_category_limit(file_path: str, model_name: str, output_json: str = None,
+                                     limit_per_category: int = None,
+                                     min_duration: int = 15, max_duration: int = 20, max_workers: int = 8,
+                                     use_cache: bool = True):
+    """
+    Generate scripts for up to `limit_per_category` topics of every category.
+    Agent calls are network-bound, so they are dispatched concurrently (at most
+    `max_workers` requests in flight at once).
+    
+    Args:
+        file_path: Path to the JSON file with topics
+        model_name: The model name to use
+        output_json: Output JSON file path
+        limit_per_category: Maximum number of topics to process per category (defaults to config)
+        min_duration: Minimum video duration in seconds
+        max_duration: Maximum video duration in seconds
+        max_workers: Maximum number of concurrent agent calls
+        use_cache: Reuse previously generated scripts for identical inputs
+    """
+    _bootstrap()
+    
+    if limit_per_category is None:
+        limit_per_category = config.ContentGenerationConfig.DEFAULT_LIMIT_PER_CATEGORY
+    
+    logger.info("Loading category prompts...")
+    category_prompts = load_category_prompts()
+    
+    logger.info("Reading JSON file: %s", file_path)
+    topics_data = load_json(file_path)
+    
+    if not isinstance(topics_data, list):
+        raise ValueError("JSON file should contain a list of topic objects")
+    
+    # Filter valid topics and group them by category in a single pass
+    topics_by_category = defaultdict(list)
+    for item in topics_data:
+        if item.get('Topics'):
+            topics_by_category[item.get('Category', 'Unknown')].append(item)
+    
+    logger.info("\n>> Found %s categories:", len(topics_by_category))
+    total_to_process = 0
+    for category, topics in topics_by_category.items():
+        will_process = min(len(topics), limit_per_category)
+        total_to_process += will_process
+        logger.info("   • %s: %s topics (processing %s)", category, len(topics), will_process)
+    
+    logger.info(">> Total topics to process: %s", total_to_process)
+    
+    # Build the list of pending calls, serving cache hits directly
+    results = []
+    jobs = []
+    for category, topics in topics_by_category.items():
+        # Agents are cached at module level, so repeated runs reuse them
+        agent = create_scriptwriter_agent(model_name, category, category_prompts)
+        prompt_hash = _hash_prompt(get_system_prompt(category, category_prompts))
+        for item in topics[:limit_per_category]:
+            topic_text = item.get('Topics', '')
+            cache_key = _script_cache_key(model_name, category, str(topic_text), min_duration, max_duration,
+                                          prompt_hash)
+            cached_script = _load_cached_script(cache_key, use_cache)
+            if cached_script is not None:
+                results.append({
+                    "id": item.get('id'),
+                    "category": category,
+                    "topic": topic_text,
+                    "script": cached_script
+                })
+                continue
+            user_message = _USER_MSG_TMPL.format(topic=topic_text, mn=min_duration, mx=max_duration, cat=category)
+            jobs.append((agent, category, item, user_message, cache_key))
+    
+    if results:
+        logger.info(">> Reusing %s cached scripts", len(results))
+    
+    async def run_all():
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        async def run_one(agent, category, item, user_message, cache_key):
+            async with semaphore:
+                try:
+                    result = await run_agent_with_retry(agent, user_message)
+                    return category, item, cache_key, result, None
+                except Exception as e:
+                    return category, item, cache_key, None, e
+        
+        tasks = [run_one(*job) for job in jobs]
+        for completed, future in enumerate(asyncio.as_completed(tasks), 1):
+            category, item, cache_key, result, error = await future
+            topic_text = item.get('Topics', '')
+            if error is None:
+                script = {
+                    "hook": remove_emojis(result.output.hook),
+                    "development": remove_emojis(result.output.development),
+                    "closing": remove_emojis(result.output.closing)
+                }
+                _store_cached_script(cache_key, script, use_cache)
+                results.append({
+                    "id": item.get('id'),
+                    "category": category,
+                    "topic": topic_text,
+                    "script": script
+                })
+                logger.info("[OK] [%s/%s] %s: %s", completed, len(jobs), category, topic_text)
+            else:
+                results.append({
+                    "id": item.get('id'),
+                    "category": category,
+                    "topic": topic_text,
+                    "error": str(error)
+                })
+                logger.error("[ERROR] [%s/%s] %s: %s - %s", completed, len(jobs), category, topic_text, error)
+    
+    if jobs:
+        logger.info("\n>> Generating %s scripts (%s concurrent requests)...", len(jobs), max_workers)
+        asyncio.run(run_all())
+    
+    results.sort(key=lambda r: (r['id'] is None, r['id'] or 0))
+    
+    if output_json is None:
+        output_json = config.ContentGenerationConfig.GENERATED_SCRIPTS_FILE_STR
+    
+    _ensure_once(os.path.dirname(output_json))
+    if not dump_json_if_changed(results, output_json):
+        logger.info(">> Output unchanged, skipped rewriting %s", output_json)
+    
+    # Tally successes, errors and per-category counts in a single pass
+    errors = 0
+    category_counts = Counter()
+    for r in results:
+        if 'error' in r:
+            errors += 1
+        else:
+            category_counts[r['category']] += 1
+    
+    logger.info("\n[OK] Results saved to: %s", output_json)
+    logger.info(">> Scripts generated: %s", len(results) - errors)
+    logger.info(">> Errors encountered: %s", errors)
+    
+    for category, count in category_counts.items():
+        logger.info("   • %s: %s scripts", category, count)
+    
+    return results
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    _bootstrap()
+    
     # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Generate video script for a specific topic ID')
-    parser.add_argument('--topic-id', type=int, required=True, 
-                       help='Topic ID to process (required, range: 1-60)')
-    parser.add_argument('--model', type=str, default=ContentGenerationConfig.DEFAULT_MODEL, 
+    parser = argparse.ArgumentParser(description='Generate video scripts for a specific topic ID or for every category')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--topic-id', type=int,
+                       help='Topic ID to process (range: 1-60)')
+    mode.add_argument('--all-categories', action='store_true',
+                       help='Process up to --limit-per-category topics of every category')
+    parser.add_argument('--limit-per-category', type=int, default=config.ContentGenerationConfig.DEFAULT_LIMIT_PER_CATEGORY,
+                       help='Maximum topics per category in --all-categories mode')
+    parser.add_argument('--max-workers', type=int, default=8,
+                       help='Maximum concurrent agent calls in --all-categories mode')
+    parser.add_argument('--model', type=str, default=config.ContentGenerationConfig.DEFAULT_MODEL, 
                        help='Model to use for generation')
-    parser.add_argument('--min-duration', type=int, default=ContentGenerationConfig.DEFAULT_MIN_DURATION, 
+    parser.add_argument('--min-duration', type=int, default=config.ContentGenerationConfig.DEFAULT_MIN_DURATION, 
                        help='Minimum video duration in seconds')
-    parser.add_argument('--max-duration', type=int, default=ContentGenerationConfig.DEFAULT_MAX_DURATION, 
+    parser.add_argument('--max-duration', type=int, default=config.ContentGenerationConfig.DEFAULT_MAX_DURATION, 
                        help='Maximum video duration in seconds')
     parser.add_argument('--output', type=str, help='Output JSON file path (optional)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always call the model, ignoring previously generated scripts')
     
     args = parser.parse_args()
     
     # Validate topic ID range
-    if args.topic_id < 1 or args.topic_id > 60:
+    if args.topic_id is not None and (args.topic_id < 1 or args.topic_id > 60):
         print(f"[ERROR] Invalid topic ID: {args.topic_id}")
         print("Valid range: 1-60")
         sys.exit(1)
     
-    print(">> VIDEO SCRIPT GENERATOR - SINGLE TOPIC MODE")
-    print("=" * 50)
-    print(f">> Target Topic ID: {args.topic_id}")
-    print(f">> Model: {args.model}")
-    print(f">> Duration: {args.min_duration}-{args.max_duration} seconds")
-    print()
-    
     # Path to the JSON file
-    json_file_path = str(ContentGenerationConfig.TOPICS_CONFIG_FILE)
+    json_file_path = config.ContentGenerationConfig.TOPICS_CONFIG_FILE_STR
     
     # Check if file exists
     if not os.path.exists(json_file_path):
@@ -284,6 +575,43 @@ if __name__ == "__main__":
         print(f"Please make sure the topics file exists")
         sys.exit(1)
     
+    if args.all_categories:
+        print(">> VIDEO SCRIPT GENERATOR - ALL CATEGORIES MODE")
+        print("=" * 50)
+        print(f">> Limit per category: {args.limit_per_category}")
+        print(f">> Model: {args.model}")
+        print(f">> Duration: {args.min_duration}-{args.max_duration} seconds")
+        print()
+        
+        try:
+            results = process_topics_by_category_limit(
+                file_path=json_file_path,
+                model_name=args.model,
+                output_json=args.output,
+                limit_per_category=args.limit_per_category,
+                min_duration=args.min_duration,
+                max_duration=args.max_duration,
+                max_workers=args.max_workers,
+                use_cache=not args.no_cache
+            )
+        except Exception as e:
+            print(f"\n[ERROR] FATAL ERROR: {str(e)}")
+            sys.exit(1)
+        
+        if any('error' not in r for r in results):
+            print("\n[OK] SUCCESS! Scripts generated successfully")
+        else:
+            print("\n[ERROR] FAILED! Could not generate any script")
+            sys.exit(1)
+        sys.exit(0)
+    
+    print(">> VIDEO SCRIPT GENERATOR - SINGLE TOPIC MODE")
+    print("=" * 50)
+    print(f">> Target Topic ID: {args.topic_id}")
+    print(f">> Model: {args.model}")
+    print(f">> Duration: {args.min_duration}-{args.max_duration} seconds")
+    print()
+    
     # Process single topic
     try:
         result = process_single_topic(
@@ -292,7 +620,8 @@ if __name__ == "__main__":
             model_name=args.model,
             output_json=args.output,
             min_duration=args.min_duration, 
-            max_duration=args.max_duration
+            max_duration=args.max_duration,
+            use_cache=not args.no_cache
         )
         
         if result:
@@ -303,4 +632,4 @@ if __name__ == "__main__":
             
     except Exception as e:
         print(f"\n[ERROR] FATAL ERROR: {str(e)}")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
\ No newline at end of file
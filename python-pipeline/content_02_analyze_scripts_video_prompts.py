@@ -1,100 +1,162 @@
-import json
+import hashlib
+import logging
 import os
 import argparse
 import sys
-from pydantic_ai import Agent
-from typing import List
-from pydantic import BaseModel
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import TYPE_CHECKING, Final, List, Optional
+from pydantic import BaseModel, TypeAdapter
 from dotenv import load_dotenv
 from config import ContentGenerationConfig
+from json_utils import load_json, dump_json, write_atomic
 
-load_dotenv()
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+logger = logging.getLogger(__name__)
+
+# Load API keys from .env only when they aren't already in the environment
+if not os.getenv("OPENAI_API_KEY"):
+    load_dotenv()
+
+# Script directories, resolved once
+_SCRIPTS_DIR = ContentGenerationConfig.GENERATED_SCRIPTS_FILE.parent
+_ANALYZED_DIR = ContentGenerationConfig.ANALYZED_SCRIPTS_FILE.parent
+_ANALYSIS_CACHE_DIR = ContentGenerationConfig.ANALYSIS_CACHE_DIR
+
+# Directories already created in this process
+_ENSURED_DIRS: set = set()
+
+def _ensure_once(directory: Path):
+    """Create a directory (and its parents) the first time it is needed in this process"""
+    if directory in _ENSURED_DIRS:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(directory)
+
+# Editing suggestions the analyzer can choose from
+NARRATOR_ONLY: Final = sys.intern("Narrator only on screen")
+NARRATOR_SPLIT: Final = sys.intern("Narrator and video split screen")
+VIDEO_ONLY: Final = sys.intern("Video only on screen")
+
+# Editing suggestions that carry a video prompt
+VIDEO_SUGGESTIONS: Final = frozenset((VIDEO_ONLY, NARRATOR_SPLIT))
 
 # Output structure per phrase
 class AnalyzedPhrase(BaseModel):
     phrase: str
     category: str
     editing_suggestion: str
+    video_prompt: Optional[str] = None
 
 # Full response model
 class ScriptAnalysis(BaseModel):
     phrases: List[AnalyzedPhrase]
 
-def create_script_analyzer_with_video_prompts(model_name: str = "gpt-4o"):
-    """Create and return a script analyzer agent that also generates video prompts"""
-    return Agent(
-        model=model_name,
-        output_type=ScriptAnalysis,
-        system_prompt="""
+# Validator for cached analyses, built once per process
+_SCRIPT_ANALYSIS_ADAPTER = TypeAdapter(ScriptAnalysis)
+
+# System prompt of the script analyzer (also part of the analysis cache key)
+_ANALYZER_SYSTEM_PROMPT = f"""
 You're a professional video editor and content strategist for short-form educational videos (like Reels or TikToks). Your task is to analyze a script and break it down **phrase by phrase**.
 
 For each phrase:
 1. Identify the phrase (split hook, development, and closing into natural complete chunks).
 2. Classify its **narrative category**, such as: rhetorical question, instruction, cultural value, emotional connection, call to action, reflection, etc.
 3. Suggest a **video editing style** for the phrase. Choose only one of the following:
-   - "Narrator only on screen"
-   - "Narrator and video split screen"
-   - "Video only on screen"
+   - "{NARRATOR_ONLY}"
+   - "{NARRATOR_SPLIT}"
+   - "{VIDEO_ONLY}"
+4. Write a **video prompt** for the phrase, only when its editing style is "{VIDEO_ONLY}" or "{NARRATOR_SPLIT}". For "{NARRATOR_ONLY}" leave video_prompt as null.
 
 📌 Fixed rules:
-- The very first phrase from the hook should **always** be "Narrator and video split screen".
-- The final phrase from the closing should **always** be "Narrator only on screen".
+- The very first phrase from the hook should **always** be "{NARRATOR_SPLIT}".
+- The final phrase from the closing should **always** be "{NARRATOR_ONLY}".
+
+🎬 VIDEO PROMPTS - A24-STYLE CINEMATOGRAPHY:
+Write each video prompt as an A24-style cinematographer: intimate, atmospheric, deeply human visual storytelling. Every prompt must include:
+- Format: start with "Vertical 9:16 cinematic format:"
+- Emotion: a genuine human moment or subtle expression
+- Lighting: natural or practical light (window light, golden hour, three-point)
+- Color: muted earth tones, naturalistic grading
+- Camera: intentional framing and movement, shallow depth of field
+- Mood: "{VIDEO_ONLY}" = standalone film vignette; "{NARRATOR_SPLIT}" = complementary atmospheric visual
+
+🎭 EXAMPLE TRANSFORMATION:
+OLD: "Close-up shot of hands placing fork and knife on empty plate at Spanish restaurant table, warm lighting, 2-3 second clip"
+
+NEW: "Vertical 9:16 cinematic format: Intimate close-up of weathered hands gently placing well-worn silverware beside a simple ceramic plate, soft natural restaurant lighting filtering through window, shallow depth of field isolating the moment, warm earth-toned color palette, contemplative pacing that honors the ritual of dining"
+
+Each video prompt contains ONLY the cinematic video prompt text, nothing else.
 
 Return the result as a list of objects with these fields:
 - phrase
 - category
 - editing_suggestion
+- video_prompt
 
 Analyze the provided script and break it down phrase by phrase following these guidelines.
 """
-    )
 
-def create_video_prompt_generator(model_name: str = "gpt-4o"):
-    """Create and return a video prompt generator agent"""
+@lru_cache(maxsize=None)
+def get_analyzer_agent(model_name: str = "gpt-4o") -> "Agent":
+    """Return the script analyzer agent (that also generates video prompts), built once per model"""
+    # Imported here so scripts rejected during validation never load pydantic-ai
+    from pydantic_ai import Agent
+    
     return Agent(
         model=model_name,
-        output_type=str,
-        system_prompt="""
-You are a cinematographer and visual storyteller specialized in creating A24-style independent films with profound emotional depth and visual poetry.
-
-Your task is to create cinematic video prompts with the aesthetic quality of A24 productions - intimate, atmospheric, and deeply human storytelling through visual language.
-
->> CINEMATIC A24 AESTHETIC PRINCIPLES:
-1. **Vertical Cinema**: Always specify "vertical 9:16 cinematic format" - like a tall canvas for visual poetry
-2. **Authentic Emotion**: Focus on genuine human moments, subtle expressions, authentic interactions
-3. **Natural Beauty**: Organic lighting, muted earth tones, real-world textures and environments
-4. **Visual Storytelling**: Every frame tells part of the story through composition and mood
-5. **Professional Cinematography**: Film-grade lighting, thoughtful framing, intentional camera movements
-
-🎬 CINEMATOGRAPHIC REQUIREMENTS:
-- **Lighting**: "natural window light", "soft golden hour glow", "intimate practical lighting", "professional three-point setup"
-- **Color Palette**: "muted earth tones", "warm naturalistic colors", "subtle color grading", "authentic skin tones"
-- **Camera Work**: "thoughtful camera movements", "intentional framing", "shallow depth of field", "cinematic composition"
-- **Atmosphere**: "intimate atmosphere", "contemplative mood", "authentic human connection", "emotional resonance"
-
-📱 CONTENT TYPE ADAPTATIONS:
-- **"Video only on screen"**: Create standalone cinematic vignettes that feel like film excerpts
-- **"Narrator and video split screen"**: Design complementary atmospheric visuals with film-quality lighting
-- **"Narrator only on screen"**: Focus on intimate portrait-style cinematography with natural environments
-
-🎭 EXAMPLE TRANSFORMATION:
-OLD: "Close-up shot of hands placing fork and knife on empty plate at Spanish restaurant table, warm lighting, 2-3 second clip"
-
-NEW: "Vertical 9:16 cinematic format: Intimate close-up of weathered hands gently placing well-worn silverware beside a simple ceramic plate, soft natural restaurant lighting filtering through window, shallow depth of field isolating the moment, warm earth-toned color palette, contemplative pacing that honors the ritual of dining"
+        output_type=ScriptAnalysis,
+        system_prompt=_ANALYZER_SYSTEM_PROMPT
+    )
 
-📋 MANDATORY CINEMATIC ELEMENTS:
-- "Vertical 9:16 cinematic format"
-- Natural, professional lighting description
-- Authentic, muted color palette
-- Thoughtful camera work and composition
-- Emotional or atmospheric context
-- Film-quality production values
+def _analysis_cache_file(script_text: str, model_name: str) -> Path:
+    """Cache file for an analysis, addressed by a hash of model, system prompt and script text"""
+    key = hashlib.blake2b(
+        "\0".join((model_name, _ANALYZER_SYSTEM_PROMPT, script_text)).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+    return _ANALYSIS_CACHE_DIR / f"{key}.json"
 
-Generate ONLY the cinematic video prompt text with A24-style aesthetic, nothing else.
-        """
-    )
+def run_script_analysis(script_text: str, model_name: str = "gpt-4o", use_cache: bool = True) -> ScriptAnalysis:
+    """
+    Run the script analyzer, reusing a cached analysis of the same input when available
+    
+    Args:
+        script_text: Script text sent to the analyzer
+        model_name: The model name to use
+        use_cache: Read and write the on-disk analysis cache
+    
+    Returns:
+        ScriptAnalysis: Phrases with editing suggestions and video prompts
+    """
+    cache_file = _analysis_cache_file(script_text, model_name)
+    
+    if use_cache and cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                analysis = _SCRIPT_ANALYSIS_ADAPTER.validate_json(f.read())
+            logger.info("[OK] Using cached analysis: %s", cache_file)
+            return analysis
+        except ValueError as e:
+            logger.warning("WARNING: Ignoring invalid cached analysis %s: %s", cache_file, e)
+    
+    logger.debug(">> Initializing AI agent...")
+    analyzer_agent = get_analyzer_agent(model_name)
+    analysis = analyzer_agent.run_sync(script_text).output
+    
+    if use_cache:
+        _ensure_once(_ANALYSIS_CACHE_DIR)
+        # Atomic write: another process may be reading or writing the same entry
+        write_atomic(cache_file, _SCRIPT_ANALYSIS_ADAPTER.dump_json(analysis))
+    
+    return analysis
 
-def analyze_single_script(script_id: int, input_file: str = None, output_file: str = None):
+def analyze_single_script(script_id: int, input_file: str = None, output_file: str = None, use_cache: bool = True,
+                          force: bool = False):
     """
     Analyze a single script by ID and generate video prompts
     
@@ -102,47 +164,51 @@ def analyze_single_script(script_id: int, input_file: str = None, output_file: s
         script_id: The specific script ID to process (required)
         input_file: Path to the script JSON file  
         output_file: Path to save the analyzed script with video prompts
+        use_cache: Reuse a cached analysis when the script text is unchanged
+        force: Re-analyze even if the output file is newer than the input file
+               (also implied by use_cache=False)
     """
     try:
         # Determine input file path
         if input_file is None:
-            base_dir = os.path.dirname(str(ContentGenerationConfig.GENERATED_SCRIPTS_FILE))
-            input_file = os.path.join(base_dir, f"script_id_{script_id}.json")
+            input_file = _SCRIPTS_DIR / f"script_id_{script_id}.json"
         
         # Determine output file path  
         if output_file is None:
-            base_dir = os.path.dirname(str(ContentGenerationConfig.ANALYZED_SCRIPTS_FILE))
-            output_file = os.path.join(base_dir, f"analyzed_script_id_{script_id}.json")
+            output_file = _ANALYZED_DIR / f"analyzed_script_id_{script_id}.json"
         
-        print(f">> SCRIPT ANALYZER - SINGLE SCRIPT MODE")
-        print("=" * 50)
-        print(f">> Target Script ID: {script_id}")
-        print(f">> Input: {input_file}")
-        print(f">> Output: {output_file}")
-        print()
+        logger.info(">> SCRIPT ANALYZER - SINGLE SCRIPT MODE")
+        logger.info("=" * 50)
+        logger.info(">> Target Script ID: %s", script_id)
+        logger.debug(">> Input: %s", input_file)
+        logger.debug(">> Output: %s", output_file)
         
         # Check if input file exists
         if not os.path.exists(input_file):
-            print(f"[ERROR] Input file not found: {input_file}")
-            print(f"Make sure you've run content_01_generate_transcriptwriter.py --topic-id {script_id} first")
+            logger.error("[ERROR] Input file not found: %s", input_file)
+            logger.info("Make sure you've run content_01_generate_transcriptwriter.py --topic-id %s first", script_id)
             return None
         
+        # Skip scripts whose analysis is already newer than the script
+        if use_cache and not force and os.path.exists(output_file) and os.path.getmtime(output_file) >= os.path.getmtime(input_file):
+            logger.info("[OK] Analysis is up to date, skipping (use --force to re-analyze): %s", output_file)
+            return load_json(output_file)
+        
         # Load script data
-        print(">> Loading script data...")
-        with open(input_file, 'r', encoding='utf-8') as f:
-            script_data = json.load(f)
+        logger.debug(">> Loading script data...")
+        script_data = load_json(input_file)
         
         # Validate script data
         script_id_in_file = script_data.get('id')
         if script_id_in_file != script_id:
-            print(f"[ERROR] Script ID mismatch! Expected {script_id}, found {script_id_in_file}")
+            logger.error("[ERROR] Script ID mismatch! Expected %s, found %s", script_id, script_id_in_file)
             return None
         
         topic = script_data.get('topic', 'Unknown topic')
         category = script_data.get('category', 'Unknown category')
         
-        print(f"[OK] Loaded script: {topic}")
-        print(f">> Category: {category}")
+        logger.info("[OK] Loaded script: %s", topic)
+        logger.debug(">> Category: %s", category)
         
         # Validate script has required parts
         script = script_data.get('script', {})
@@ -151,17 +217,12 @@ def analyze_single_script(script_id: int, input_file: str = None, output_file: s
         closing = script.get('closing', '')
         
         if not hook or not development or not closing:
-            print(f"[ERROR] Script {script_id} has missing parts!")
-            print(f"Hook: {'[OK]' if hook else '[ERROR]'}")
-            print(f"Development: {'[OK]' if development else '[ERROR]'}")
-            print(f"Closing: {'[OK]' if closing else '[ERROR]'}")
+            logger.error("[ERROR] Script %s has missing parts!", script_id)
+            logger.info("Hook: %s", '[OK]' if hook else '[ERROR]')
+            logger.info("Development: %s", '[OK]' if development else '[ERROR]')
+            logger.info("Closing: %s", '[OK]' if closing else '[ERROR]')
             return None
         
-        # Create both agents
-        print(">> Initializing AI agents...")
-        analyzer_agent = create_script_analyzer_with_video_prompts()
-        video_agent = create_video_prompt_generator()
-        
         # Create script text for analysis
         script_text = f"""
         Hook: {hook}
@@ -169,58 +230,25 @@ def analyze_single_script(script_id: int, input_file: str = None, output_file: s
         Closing: {closing}
         """
         
-        print(">> Step 1: Analyzing script phrase by phrase...")
+        logger.debug(">> Analyzing script phrase by phrase and generating video prompts...")
         
-        # Run phrase analysis
-        analysis_result = analyzer_agent.run_sync(script_text)
+        # Run phrase analysis (video prompts come in the same response)
+        analysis = run_script_analysis(script_text, use_cache=use_cache)
         
-        print(f"[OK] Analysis complete: {len(analysis_result.output.phrases)} phrases found")
-        
-        # Generate video prompts for each phrase
-        print(">> Step 2: Generating video prompts...")
+        logger.info("[OK] Analysis complete: %s phrases found", len(analysis.phrases))
         
         video_prompts_with_analysis = []
+        for j, phrase in enumerate(analysis.phrases, 1):
+            video_prompts_with_analysis.append({
+                'phrase_number': j,
+                'phrase': phrase.phrase,
+                'category': phrase.category,
+                'editing_suggestion': phrase.editing_suggestion,
+                'video_prompt': phrase.video_prompt if phrase.editing_suggestion in VIDEO_SUGGESTIONS else None
+            })
         
-        for j, phrase in enumerate(analysis_result.output.phrases, 1):
-            try:
-                # Generate video_prompt for "Video only on screen" and "Narrator and video split screen"
-                if phrase.editing_suggestion in ["Video only on screen", "Narrator and video split screen"]:
-                    print(f"    >> Generating video prompt for phrase {j}")
-                    
-                    # Create input for video prompt generation
-                    prompt_input = f"""
-                    Script phrase: {phrase.phrase}
-                    Editing suggestion: {phrase.editing_suggestion}
-                    Narrative category: {phrase.category}
-                    """
-                    
-                    # Generate video prompt
-                    video_result = video_agent.run_sync(prompt_input)
-                    video_prompt = video_result.output if hasattr(video_result, 'output') else str(video_result)
-                    
-                    print(f"    [OK] Video prompt generated for phrase {j}")
-                else:
-                    video_prompt = None
-                    print(f"    >> No video prompt needed for phrase {j} ({phrase.editing_suggestion})")
-                
-                video_prompts_with_analysis.append({
-                    'phrase_number': j,
-                    'phrase': phrase.phrase,
-                    'category': phrase.category,
-                    'editing_suggestion': phrase.editing_suggestion,
-                    'video_prompt': video_prompt
-                })
-                
-            except Exception as e:
-                print(f"    [ERROR] Error processing phrase {j}: {e}")
-                # Add fallback entry
-                video_prompts_with_analysis.append({
-                    'phrase_number': j,
-                    'phrase': phrase.phrase,
-                    'category': phrase.category,
-                    'editing_suggestion': phrase.editing_suggestion,
-                    'video_prompt': None
-                })
+        # Count editing suggestions in one pass
+        suggestion_counts = Counter(p['editing_suggestion'] for p in video_prompts_with_analysis)
         
         # Build final result
         result = {
@@ -238,71 +266,124 @@ def analyze_single_script(script_id: int, input_file: str = None, output_file: s
             },
             'summary': {
                 'editing_breakdown': {
-                    'narrator_only': len([p for p in video_prompts_with_analysis if p['editing_suggestion'] == "Narrator only on screen"]),
-                    'narrator_and_video': len([p for p in video_prompts_with_analysis if p['editing_suggestion'] == "Narrator and video split screen"]),
-                    'video_only': len([p for p in video_prompts_with_analysis if p['editing_suggestion'] == "Video only on screen"])
+                    'narrator_only': suggestion_counts[NARRATOR_ONLY],
+                    'narrator_and_video': suggestion_counts[NARRATOR_SPLIT],
+                    'video_only': suggestion_counts[VIDEO_ONLY]
                 }
             },
             'status': 'success'
         }
         
         # Save results
-        print(f">> Saving analyzed script...")
+        logger.debug(">> Saving analyzed script...")
         
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        _ensure_once(Path(output_file).parent)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        dump_json(result, output_file)
         
         # Print summary
         video_prompts_count = len([p for p in video_prompts_with_analysis if p.get('video_prompt') is not None])
         
-        print(f"\n[OK] Analysis completed successfully!")
-        print(f">> Results:")
-        print(f"   • Script ID: {script_id}")
-        print(f"   • Total phrases: {len(video_prompts_with_analysis)}")
-        print(f"   • Video prompts generated: {video_prompts_count}")
-        print(f"   • Output file: {output_file}")
+        logger.info("\n[OK] Analysis completed successfully!")
+        logger.info(">> Results:")
+        logger.info("   • Script ID: %s", script_id)
+        logger.info("   • Total phrases: %s", len(video_prompts_with_analysis))
+        logger.info("   • Video prompts generated: %s", video_prompts_count)
+        logger.info("   • Output file: %s", output_file)
         
         # Show editing breakdown
         breakdown = result['summary']['editing_breakdown']
-        print(f"\n>> Editing suggestions breakdown:")
-        print(f"   • Narrator only: {breakdown['narrator_only']}")
-        print(f"   • Narrator and video: {breakdown['narrator_and_video']}")
-        print(f"   • Video only: {breakdown['video_only']}")
+        logger.info("\n>> Editing suggestions breakdown:")
+        logger.info("   • Narrator only: %s", breakdown['narrator_only'])
+        logger.info("   • Narrator and video: %s", breakdown['narrator_and_video'])
+        logger.info("   • Video only: %s", breakdown['video_only'])
         
         return result
         
     except Exception as e:
-        print(f"[ERROR] Error analyzing script {script_id}: {e}")
+        logger.error("[ERROR] Error analyzing script %s: %s", script_id, e)
         return None
 
+def analyze_multiple_scripts(script_ids: List[int], max_workers: int = None, use_cache: bool = True,
+                             force: bool = False) -> list:
+    """
+    Analyze several scripts concurrently (each analysis is dominated by network wait)
+    
+    Args:
+        script_ids: Script IDs to process
+        max_workers: Maximum number of scripts in flight (defaults to SCRIPT_CONCURRENCY or 8)
+        use_cache: Reuse cached analyses when the script text is unchanged
+        force: Re-analyze scripts whose output is already up to date
+    
+    Returns:
+        list: Results of the successfully analyzed scripts, sorted by script ID
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("SCRIPT_CONCURRENCY", "8"))
+    
+    # A repeated ID would make two workers write the same files at once
+    script_ids = list(dict.fromkeys(script_ids))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(analyze_single_script, script_id, use_cache=use_cache, force=force) for script_id in script_ids]
+        results = [future.result() for future in as_completed(futures)]
+    
+    return sorted((r for r in results if r), key=lambda r: r['id'])
+
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOGLEVEL", "INFO"), format="%(message)s", stream=sys.stdout)
+    
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Analyze and generate video prompts for a specific script ID')
-    parser.add_argument('--script-id', type=int, required=True,
-                       help='Script ID to process (required, range: 1-60)')
-    parser.add_argument('--input-file', type=str, help='Input script JSON file (optional)')
-    parser.add_argument('--output-file', type=str, help='Output analyzed script JSON file (optional)')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--script-id', type=int,
+                       help='Script ID to process (range: 1-60)')
+    target.add_argument('--script-ids', type=int, nargs='+',
+                       help='Several script IDs to process concurrently (range: 1-60)')
+    parser.add_argument('--input-file', type=str, help='Input script JSON file (optional, single script only)')
+    parser.add_argument('--output-file', type=str, help='Output analyzed script JSON file (optional, single script only)')
+    parser.add_argument('--max-workers', type=int, default=None,
+                       help='Maximum number of scripts analyzed at once (default: SCRIPT_CONCURRENCY or 8)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always call the model, ignoring cached analyses')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-analyze even if the analyzed script is newer than the script')
     
     args = parser.parse_args()
     
     # Validate script ID range
-    if args.script_id < 1 or args.script_id > 60:
-        print(f"[ERROR] Invalid script ID: {args.script_id}")
+    script_ids = args.script_ids or [args.script_id]
+    invalid_ids = [script_id for script_id in script_ids if script_id < 1 or script_id > 60]
+    if invalid_ids:
+        print(f"[ERROR] Invalid script ID: {', '.join(map(str, invalid_ids))}")
         print("Valid range: 1-60")
         sys.exit(1)
     
+    if args.script_ids:
+        # Process several scripts
+        results = analyze_multiple_scripts(script_ids, max_workers=args.max_workers, use_cache=not args.no_cache,
+                                           force=args.force)
+        
+        print(f"\n>> Scripts analyzed: {len(results)}/{len(script_ids)}")
+        if len(results) < len(script_ids):
+            failed_ids = sorted(set(script_ids) - {r['id'] for r in results})
+            print(f"\n[ERROR] FAILED! Could not analyze scripts: {', '.join(map(str, failed_ids))}")
+            sys.exit(1)
+        print("\n[OK] SUCCESS! All scripts analyzed successfully")
+        sys.exit(0)
+    
     # Process single script
     result = analyze_single_script(
         script_id=args.script_id,
         input_file=args.input_file,
-        output_file=args.output_file
+        output_file=args.output_file,
+        use_cache=not args.no_cache,
+        force=args.force
     )
     
     if result:
         print("\n[OK] SUCCESS! Script analyzed successfully")
     else:
         print("\n[ERROR] FAILED! Could not analyze script")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
+import hashlib
 import json
+import re
 import sys
-import argparse
 from datetime import datetime
 import os
+from pathlib import Path
 from config import ContentGenerationConfig
+from json_utils import load_json, dumps_json, write_atomic
 
 def load_script_data(json_file_path):
     """Carga los datos del archivo JSON de script analizado"""
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        return load_json(json_file_path)
     except FileNotFoundError:
         print(f"[ERROR] Error: No se encontró el archivo {json_file_path}")
         return None
@@ -18,6 +20,9 @@ def load_script_data(json_file_path):
         print(f"[ERROR] Error: El archivo {json_file_path} no es un JSON válido")
         return None
 
+# Separa el development en viñetas 👉 (absorbe los espacios alrededor del marcador)
+_BULLET_SPLIT = re.compile(r'\s*👉\s*')
+
 def parse_script_to_phrases(script_data):
     """Convierte el script en frases individuales"""
     script = script_data.get('original_script', {})
@@ -35,13 +40,10 @@ def parse_script_to_phrases(script_data):
     if development:
         # Dividir por 👉 o por puntos si es muy largo
         if '👉' in development:
-            parts = development.split('👉')
-            for i, part in enumerate(parts):
-                if part.strip():
-                    if i == 0:
-                        phrases.append(part.strip())
-                    else:
-                        phrases.append(f"👉{part.strip()}")
+            head, *bullets = _BULLET_SPLIT.split(development.strip())
+            if head:
+                phrases.append(head)
+            phrases.extend("👉" + bullet for bullet in bullets if bullet)
         else:
             phrases.append(development)
     
@@ -51,13 +53,18 @@ def parse_script_to_phrases(script_data):
     
     return phrases
 
-def generate_narrator_script(script_data, script_id):
-    """Genera el guión HTML para un script específico"""
-    
-    topic = script_data.get('topic', 'Sin título')
-    category = script_data.get('category', 'Sin categoría')
-    
-    script_content = f"""<!DOCTYPE html>
+# Directorios de entrada y salida (resueltos una sola vez)
+_ANALYZED_DIR = ContentGenerationConfig.ANALYZED_SCRIPTS_FILE.parent
+_NARRATOR_DIR = ContentGenerationConfig.NARRATOR_SCRIPTS_DIR
+
+# Escapado HTML de los textos del script (una pasada de str.translate)
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+# Versión del renderizado; incrementarla al cambiar cómo se genera el HTML invalida los hashes guardados
+_RENDER_VERSION = 2
+
+# Plantillas HTML del guión (se construyen una sola vez al importar)
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
@@ -120,36 +127,86 @@ def generate_narrator_script(script_data, script_id):
     </div>
 
 """
-    
-    # Obtener las frases parseadas
-    phrases = parse_script_to_phrases(script_data)
-    
-    for phrase_text in phrases:
-        script_content += f"""    <div class="phrase">
-        <span class="narrator-instruction"></span><span class="phrase-text">"{phrase_text}"</span>
+
+_PHRASE_TMPL = """    <div class="phrase">
+        <span class="narrator-instruction"></span><span class="phrase-text">"%s"</span>
     </div>
 
 """
-    
-    script_content += f"""    <div class="timestamp">
-        Generado el {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+_HTML_TAIL = """    <div class="timestamp">
+        Generado el {timestamp}
     </div>
 </body>
 </html>"""
+
+def render_narrator_parts(script_data, script_id, timestamp=None):
+    """
+    Genera el guión HTML para un script específico como lista de fragmentos (en orden)
+    timestamp: texto de fecha del pie; se calcula si no se pasa (pasar uno solo por ejecución al generar varios)
+    """
+    if timestamp is None:
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
-    return script_content
+    topic = script_data.get('topic', 'Sin título')
+    category = script_data.get('category', 'Sin categoría')
+    
+    # Obtener las frases parseadas
+    phrases = parse_script_to_phrases(script_data)
+    
+    parts = [_HTML_HEAD.format(script_id=script_id,
+                               category=category.translate(_HTML_ESCAPE),
+                               topic=topic.translate(_HTML_ESCAPE))]
+    parts.append("".join([_PHRASE_TMPL % phrase_text.translate(_HTML_ESCAPE) for phrase_text in phrases]))
+    parts.append(_HTML_TAIL.format(timestamp=timestamp))
+    
+    return parts
+
+def generate_narrator_script(script_data, script_id, timestamp=None):
+    """Genera el guión HTML para un script específico"""
+    return "".join(render_narrator_parts(script_data, script_id, timestamp))
+
+def _write_all(fd, chunks):
+    """Escribe todos los fragmentos en fd con una sola llamada writev cuando el sistema la soporta"""
+    written = os.writev(fd, chunks) if hasattr(os, 'writev') and len(chunks) <= 1024 else 0
+    remaining = b"".join(chunks)[written:] if written < sum(map(len, chunks)) else b""
+    while remaining:
+        remaining = remaining[os.write(fd, remaining):]
 
 def save_narrator_script(content, output_file):
-    """Guarda el guión en un archivo HTML"""
+    """Guarda el guión en un archivo HTML (content puede ser el texto completo o la lista de fragmentos)"""
     try:
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write(content)
+        parts = [content] if isinstance(content, str) else content
+        chunks = [part.encode('utf-8') for part in parts]
+        fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            _write_all(fd, chunks)
+        finally:
+            os.close(fd)
         return True
     except Exception as e:
         print(f"[ERROR] Error al guardar el archivo {output_file}: {e}")
         return False
 
-def generate_single_narrator_script(script_id: int, input_file: str = None, output_file: str = None):
+def _script_hash(script_data):
+    """Hash del contenido del script y de las plantillas, usado para saber si hay que regenerar el HTML"""
+    digest = hashlib.blake2b(dumps_json(script_data), digest_size=16)
+    digest.update(f"{_RENDER_VERSION}{_HTML_HEAD}{_PHRASE_TMPL}{_HTML_TAIL}".encode('utf-8'))
+    return digest.hexdigest()
+
+def _hash_file(output_file):
+    """Archivo con el hash del script usado para generar output_file (uno por HTML, sin índice compartido)"""
+    return output_file.with_name(output_file.name + ".hash")
+
+def _load_hash(hash_file):
+    """Lee el hash guardado junto a un HTML (None si no existe)"""
+    try:
+        with open(hash_file, 'r', encoding='ascii') as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+def generate_single_narrator_script(script_id: int, input_file: str = None, output_file: str = None, force: bool = False):
     """
     Genera el guión del locutor para un script específico por ID
     
@@ -157,17 +214,17 @@ def generate_single_narrator_script(script_id: int, input_file: str = None, outp
         script_id: ID del script a procesar (obligatorio)
         input_file: Archivo JSON de entrada (opcional)
         output_file: Archivo HTML de salida (opcional)
+        force: Regenerar aunque el script no haya cambiado desde la última generación
     """
     try:
         # Determinar archivo de entrada
         if input_file is None:
-            base_dir = os.path.dirname(str(ContentGenerationConfig.ANALYZED_SCRIPTS_FILE))
-            input_file = os.path.join(base_dir, f"analyzed_script_id_{script_id}.json")
+            input_file = _ANALYZED_DIR / f"analyzed_script_id_{script_id}.json"
         
         # Determinar archivo de salida
         if output_file is None:
-            scripts_dir = str(ContentGenerationConfig.NARRATOR_SCRIPTS_DIR)
-            output_file = os.path.join(scripts_dir, f"narrator_script_id_{script_id}.html")
+            output_file = _NARRATOR_DIR / f"narrator_script_id_{script_id}.html"
+        output_file = Path(output_file)
         
         print(">> NARRATOR SCRIPT GENERATOR - SINGLE SCRIPT MODE")
         print("=" * 55)
@@ -183,7 +240,7 @@ def generate_single_narrator_script(script_id: int, input_file: str = None, outp
             return False
         
         # Crear carpeta de salida si no existe
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Cargar datos del script
         print(f">> Loading analyzed script data...")
@@ -210,13 +267,21 @@ def generate_single_narrator_script(script_id: int, input_file: str = None, outp
         print(f"[OK] Loaded script: {topic}")
         print(f">> Category: {category}")
         
+        # Saltar la generación si el script no cambió desde el último HTML generado
+        hash_file = _hash_file(output_file)
+        script_hash = _script_hash(script_data)
+        if not force and _load_hash(hash_file) == script_hash and output_file.exists():
+            print(f"[OK] Narrator script is up to date, skipping (use --force to regenerate): {output_file}")
+            return True
+        
         # Generar el guión HTML
         print(f">> Generating narrator script...")
-        narrator_script = generate_narrator_script(script_data, script_id)
+        narrator_script = render_narrator_parts(script_data, script_id)
         
         # Guardar el archivo
         print(f">> Saving HTML file...")
         if save_narrator_script(narrator_script, output_file):
+            write_atomic(hash_file, script_hash.encode('ascii'))
             print(f"[OK] Narrator script generated successfully!")
             print(f">> Saved to: {output_file}")
             print(f">> Topic: {topic}")
@@ -232,6 +297,8 @@ def generate_single_narrator_script(script_id: int, input_file: str = None, outp
 
 def main():
     """Función principal"""
+    # Importado aquí: solo la CLI lo necesita
+    import argparse
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Generate narrator script for a specific script ID')
@@ -239,6 +306,8 @@ def main():
                        help='Script ID to process (required, range: 1-60)')
     parser.add_argument('--input-file', type=str, help='Input analyzed script JSON file (optional)')
     parser.add_argument('--output-file', type=str, help='Output HTML file (optional)')
+    parser.add_argument('--force', action='store_true',
+                       help='Regenerate even if the script has not changed')
     
     args = parser.parse_args()
     
@@ -252,7 +321,8 @@ def main():
     success = generate_single_narrator_script(
         script_id=args.script_id,
         input_file=args.input_file,
-        output_file=args.output_file
+        output_file=args.output_file,
+        force=args.force
     )
     
     if success:
@@ -0,0 +1,84 @@
+"""
+Lectura y escritura de JSON para el pipeline
+Usa orjson (parser/serializador en C) si está instalado y json de la librería estándar si no
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads_json(data):
+    """Parsea JSON desde bytes o str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(data) -> bytes:
+    """Serializa a JSON UTF-8 con indentación de 2 espacios (mismo formato que json.dump(indent=2, ensure_ascii=False))"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def load_json(path):
+    """Carga un archivo JSON"""
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+def dump_json(data, path):
+    """Guarda datos en un archivo JSON"""
+    with open(path, 'wb') as f:
+        f.write(dumps_json(data))
+
+
+def write_atomic(path, payload: bytes):
+    """
+    Escribe bytes en path de forma atómica (archivo temporal + os.replace)
+    El temporal lleva el pid y el hilo, así varios procesos pueden escribir el mismo path a la vez
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _file_digest(path):
+    """Hash blake2b de un archivo, leído en bloques de 64KB"""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def dump_json_if_changed(data, path):
+    """
+    Guarda datos en un archivo JSON solo si el contenido cambió
+    La escritura es atómica (archivo temporal + os.replace)
+    
+    Returns:
+        bool: True si se escribió el archivo, False si ya tenía el mismo contenido
+    """
+    payload = dumps_json(data)
+    
+    if os.path.exists(path) and _file_digest(path) == hashlib.blake2b(payload).digest():
+        return False
+    
+    write_atomic(path, payload)
+    return True
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 MAIN.PY - PIPELINE COMPLETO DE PRODUCCIÓN DE VIDEO
-Ejecuta directamente todos los scripts individuales en secuencia:
+Ejecuta directamente todos los scripts individuales respetando sus dependencias
+(los pasos independientes, p.ej. contenido y procesamiento de video, corren en paralelo):
 
 FASE 1: GENERACIÓN DE CONTENIDO
 1. content_01_generate_transcriptwriter.py - Genera script desde topic
@@ -22,13 +23,19 @@ FASE 4: OBTENCIÓN DE VIDEOS
 10. search_stock_footage.py - Busca y descarga videos de Pexels/Pixabay
 """
 
+import asyncio
 import subprocess
 import sys
 import argparse
+import threading
 import time
 import os
 import json
+import re
 import shutil
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -37,13 +44,60 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-def clean_project_directories(script_id: int, clean_all: bool = False):
+# Archivos de configuración que la limpieza nunca elimina
+PROTECTED_FILES = frozenset({
+    "topics.json",
+    "category_prompts.json",
+    "config.py",
+    ".env",
+    ".gitignore"
+})
+
+
+def _collect_stale_entries(dir_path: str, current_script_pattern: re.Pattern, protected_files: frozenset):
+    """
+    Recorre dir_path con os.scandir y devuelve (archivos, carpetas) que no pertenecen
+    al script actual. Los archivos protegidos nunca se incluyen.
+    """
+    stale_files = []
+    stale_dirs = []
+    pending = deque([dir_path])
+    
+    # DirEntry trae el tipo de la propia lectura del directorio: is_file/is_dir sin stat extra
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                name = entry.name
+                is_current_script = current_script_pattern.search(name) is not None
+                if entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                    # Los enlaces simbólicos se eliminan como archivos, sin seguirlos
+                    if not is_current_script and name not in protected_files:
+                        stale_files.append(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    if not is_current_script:
+                        stale_dirs.append(entry.path)
+                    pending.append(entry.path)
+    
+    return stale_files, stale_dirs
+
+
+def _unlink_quiet(path: str):
+    """Elimina un archivo; devuelve la excepción en lugar de lanzarla (None si OK)"""
+    try:
+        os.unlink(path)
+        return None
+    except OSError as e:
+        return e
+
+
+def clean_project_directories(script_id: int, clean_all: bool = False, keep_script_ids: list = None):
     """
     Limpia las carpetas de inputs y outputs para mantener orden en cada proyecto
     
     Args:
         script_id: ID del script a procesar
         clean_all: Si True, limpia TODO (modo --reset). Si False, elimina todo EXCEPTO archivos del script_id específico
+        keep_script_ids: IDs adicionales cuyos archivos también se preservan (modo --script-ids)
     """
     
     print(f">> Limpiando carpetas del proyecto...")
@@ -71,77 +125,69 @@ def clean_project_directories(script_id: int, clean_all: bool = False):
         "VideoProduction/00_checkpoints"
     ]
     
+    # Solo dependen de los script_id: se construyen una vez para todas las carpetas
+    current_script_patterns = tuple(
+        pattern
+        for kept_id in dict.fromkeys([script_id] + list(keep_script_ids or []))
+        for pattern in (f"script_id_{kept_id}", f"_id_{kept_id}", f"script_{kept_id}_")
+    )
+    current_script_pattern = re.compile('|'.join(map(re.escape, current_script_patterns)))
+    
     cleaned_count = 0
+    existing_dirs = [Path(dir_path) for dir_path in directories_to_clean if Path(dir_path).exists()]
     
-    for dir_path in directories_to_clean:
-        dir_path = Path(dir_path)
-        
-        if not dir_path.exists():
-            continue
-            
-        try:
-            if clean_all:
+    if clean_all:
+        for dir_path in existing_dirs:
+            try:
                 # Limpiar toda la carpeta
-                if dir_path.exists() and any(dir_path.iterdir()):
+                if any(dir_path.iterdir()):
                     shutil.rmtree(dir_path)
                     dir_path.mkdir(parents=True, exist_ok=True)
                     cleaned_count += 1
                     print(f"   ✅ Limpiada: {dir_path}")
-            else:
-                # Eliminar todo EXCEPTO archivos del script_id actual y archivos de configuración
-                current_script_patterns = [
-                    f"script_id_{script_id}",
-                    f"_id_{script_id}",
-                    f"script_{script_id}_",
-                ]
-                
-                protected_files = {
-                    "topics.json", 
-                    "category_prompts.json",
-                    "config.py",
-                    ".env",
-                    ".gitignore"
-                }
-                
-                files_removed = 0
-                for file_path in dir_path.rglob("*"):
-                    if file_path.is_file():
-                        file_name = file_path.name
-                        
-                        # Verificar si es del script actual
-                        is_current_script = any(pattern in file_name for pattern in current_script_patterns)
-                        
-                        # Verificar si es archivo de configuración protegido
-                        is_protected = file_name in protected_files
-                        
-                        # Eliminar solo si NO es del script actual y NO está protegido
-                        if not is_current_script and not is_protected:
-                            try:
-                                file_path.unlink()
-                                files_removed += 1
-                            except Exception as e:
-                                print(f"   ⚠️  Error eliminando {file_path}: {e}")
-                    
-                    elif file_path.is_dir() and file_path != dir_path:
-                        # Verificar si la carpeta está relacionada con el script actual
-                        dir_name = file_path.name
-                        is_current_script_dir = any(pattern in dir_name for pattern in current_script_patterns)
-                        
-                        # Si la carpeta no es del script actual y está vacía, eliminarla
-                        if not is_current_script_dir:
-                            try:
-                                if not any(file_path.iterdir()):
-                                    file_path.rmdir()
-                                    files_removed += 1
-                            except Exception:
-                                pass  # Ignorar errores al eliminar carpetas
-
-                if files_removed > 0:
-                    cleaned_count += 1
-                    print(f"   ✅ Limpiada: {dir_path} ({files_removed} archivos)")
-                    
-        except Exception as e:
-            print(f"   ⚠️  Error limpiando {dir_path}: {e}")
+            except Exception as e:
+                print(f"   ⚠️  Error limpiando {dir_path}: {e}")
+    else:
+        # Eliminar todo EXCEPTO archivos del script_id actual y archivos de configuración
+        # 1) Indexar todas las carpetas a la vez (el recorrido es I/O y libera el GIL)
+        stale_index = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                dir_path: executor.submit(_collect_stale_entries, str(dir_path), current_script_pattern, PROTECTED_FILES)
+                for dir_path in existing_dirs
+            }
+            for dir_path, future in futures.items():
+                try:
+                    stale_index[dir_path] = future.result()
+                except Exception as e:
+                    print(f"   ⚠️  Error limpiando {dir_path}: {e}")
+        
+        # 2) Eliminar todos los archivos recolectados en un único pool
+        victims = [(dir_path, file_path) for dir_path, (stale_files, _) in stale_index.items() for file_path in stale_files]
+        removed_per_dir = Counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = executor.map(_unlink_quiet, [file_path for _, file_path in victims])
+            for (dir_path, file_path), error in zip(victims, results):
+                if error is None:
+                    removed_per_dir[dir_path] += 1
+                else:
+                    print(f"   ⚠️  Error eliminando {Path(file_path)}: {error}")
+        
+        # 3) Si la carpeta no es del script actual y quedó vacía, eliminarla
+        # El recorrido agrega cada carpeta antes que sus subcarpetas: en orden inverso las
+        # hijas se eliminan primero y el padre ya está vacío cuando le toca (post-orden)
+        for dir_path, (_, stale_dirs) in stale_index.items():
+            for stale_dir in reversed(stale_dirs):
+                try:
+                    os.rmdir(stale_dir)
+                    removed_per_dir[dir_path] += 1
+                except OSError:
+                    pass  # Ignorar errores al eliminar carpetas (p.ej. no está vacía)
+        
+        for dir_path in stale_index:
+            if removed_per_dir[dir_path] > 0:
+                cleaned_count += 1
+                print(f"   ✅ Limpiada: {dir_path} ({removed_per_dir[dir_path]} archivos)")
     
     # Limpiar archivos temporales en la raíz (estos siempre se pueden eliminar)
     root_files_to_clean = [
@@ -167,6 +213,14 @@ def clean_project_directories(script_id: int, clean_all: bool = False):
         print(f"[INFO] No había archivos para limpiar")
 
 
+def completed_steps_from_checkpoint(checkpoint: dict) -> set:
+    """Decodifica el conjunto de pasos completados de un checkpoint (incluye formatos antiguos)"""
+    if "completed_steps" in checkpoint:
+        return set(checkpoint["completed_steps"])
+    # Checkpoints antiguos: progreso secuencial hasta last_completed_step
+    return set(range(1, checkpoint.get("last_completed_step", 0) + 1))
+
+
 class CheckpointManager:
     """Maneja los checkpoints para retomar pipeline desde donde se quedó"""
     
@@ -175,20 +229,68 @@ class CheckpointManager:
         self.checkpoint_dir = Path("VideoProduction/00_checkpoints")
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
         self.checkpoint_file = self.checkpoint_dir / f"checkpoint_script_id_{script_id}.json"
+        self.timings_file = self.checkpoint_dir / f"timings_script_id_{script_id}.jsonl"
     
-    def save_checkpoint(self, step_number: int, step_name: str, parameters: dict = None):
-        """Guarda checkpoint después de completar un paso"""
+    def save_checkpoint(self, step_number: int, step_name: str, completed_steps: set, parameters: dict = None):
+        """
+        Guarda checkpoint después de completar un paso
+        
+        completed_steps es el conjunto explícito de pasos completados: con ramas en paralelo
+        el progreso no es necesariamente contiguo (p.ej. {1, 2, 4}), así que last_completed_step
+        no alcanza para retomar. Se guarda como lista ordenada en "completed_steps" (a lo sumo
+        una entrada por paso del pipeline, un costo despreciable que mantiene el archivo legible)
+        """
         checkpoint_data = {
             "script_id": self.script_id,
             "last_completed_step": step_number,
             "step_name": step_name,
-            "completed_steps": list(range(1, step_number + 1)),
+            "completed_steps": sorted(completed_steps),
             "timestamp": datetime.now().isoformat(),
             "parameters": parameters or {}
         }
         
-        with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
+        # JSON compacto (el archivo solo lo lee el pipeline) escrito de forma atómica y
+        # durable: fsync del archivo antes del rename y de la carpeta después, así ni un
+        # corte de luz deja el checkpoint truncado o perdido
+        tmp_file = self.checkpoint_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(checkpoint_data, ensure_ascii=False, separators=(',', ':')))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.checkpoint_file)
+        self._fsync_checkpoint_dir()
+    
+    def _fsync_checkpoint_dir(self):
+        """Sincroniza la carpeta de checkpoints para que el rename sobreviva a un corte"""
+        try:
+            fd = os.open(self.checkpoint_dir, os.O_RDONLY)
+        except OSError:
+            return  # Windows no permite abrir carpetas con os.open: se omite
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def append_timing(self, step_number: int, step_name: str, duration: float, rss_peak: int = None,
+                      success: bool = True):
+        """
+        Agrega una línea JSON con la duración y el pico de memoria de un paso
+        
+        El archivo es append-only y se conserva entre ejecuciones (no se borra con el
+        checkpoint), para poder decidir el paralelismo a partir de datos reales
+        """
+        record = {
+            "step": step_number,
+            "name": step_name,
+            "duration_s": duration,
+            "rss_kb": rss_peak,
+            "ok": success,
+            "timestamp": datetime.now().isoformat()
+        }
+        with open(self.timings_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
     
     def load_checkpoint(self):
         """Carga checkpoint existente si existe"""
@@ -207,12 +309,12 @@ class CheckpointManager:
         if self.checkpoint_file.exists():
             self.checkpoint_file.unlink()
     
-    def get_resume_step(self):
-        """Obtiene el número de paso desde donde retomar"""
+    def get_completed_steps(self):
+        """Obtiene el conjunto de pasos ya completados (vacío si no hay checkpoint)"""
         checkpoint = self.load_checkpoint()
-        if checkpoint:
-            return checkpoint.get("last_completed_step", 0) + 1
-        return 1
+        if not checkpoint:
+            return set()
+        return completed_steps_from_checkpoint(checkpoint)
     
     def show_checkpoint_status(self, total_steps: int):
         """Muestra estado del checkpoint si existe"""
@@ -224,7 +326,7 @@ class CheckpointManager:
         print(f"   Última ejecución: {checkpoint.get('timestamp', 'Unknown')}")
         print(f"   Último paso completado: {checkpoint.get('last_completed_step', 0)}/{total_steps}")
         print(f"   Último paso: {checkpoint.get('step_name', 'Unknown')}")
-        print(f"   Pasos completados: {len(checkpoint.get('completed_steps', []))}/{total_steps}")
+        print(f"   Pasos completados: {len(completed_steps_from_checkpoint(checkpoint))}/{total_steps}")
         
         # Verificar si los parámetros son compatibles
         if checkpoint.get('parameters'):
@@ -233,70 +335,255 @@ class CheckpointManager:
         return True
 
 
-def run_command_quiet(command: list, step_name: str, step_number: int, total_steps: int) -> bool:
+# Líneas de stdout/stderr que se conservan por paso (para mostrar y para el reporte de errores)
+OUTPUT_TAIL_LINES = 500
+
+
+def _read_stream_tail(stream, tail: deque):
+    """Lee un stream línea a línea conservando solo las últimas en tail"""
+    with stream:
+        for line in stream:
+            tail.append(line)
+
+
+def _wait_with_rusage(process: subprocess.Popen):
+    """
+    Espera a que termine el proceso y devuelve (returncode, pico de memoria RSS en KB)
+    
+    Usa os.wait4 para obtener el uso de recursos de ese hijo en concreto (con pasos en
+    paralelo, RUSAGE_CHILDREN mezclaría varios). Donde no existe (Windows) el RSS es None.
+    """
+    if not hasattr(os, "wait4"):
+        return process.wait(), None
+    
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss viene en KB en Linux y en bytes en macOS
+    rss_kb = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    return process.returncode, rss_kb
+
+
+def run_command_quiet(command: list, step_name: str, step_number: int, total_steps: int,
+                      stats: dict = None) -> bool:
     """
     Ejecuta un comando mostrando información esencial y errores detallados
+    
+    Si se pasa stats, se completa con "duration_s" y "rss_kb" del paso
     """
     print(f"\n[{step_number}/{total_steps}] {step_name}...")
     
+    start_time = time.perf_counter()
+    error = None
     try:
-        start_time = time.time()
-        
-        # Ejecutar el comando capturando output para mejor trazabilidad de errores
-        result = subprocess.run(
+        # Ejecutar el comando leyendo su output en streaming: solo se guardan las
+        # últimas líneas de cada stream, así la memoria no crece con pasos muy verbosos
+        process = subprocess.Popen(
             command,
-            check=True,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1,
             text=True,
             encoding='utf-8',
             errors='replace'
         )
         
-        end_time = time.time()
-        duration = end_time - start_time
+        stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        readers = [
+            threading.Thread(target=_read_stream_tail, args=(process.stdout, stdout_tail), daemon=True),
+            threading.Thread(target=_read_stream_tail, args=(process.stderr, stderr_tail), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
         
-        # Mostrar output si existe (para debug)
-        if result.stdout.strip():
-            print(result.stdout.strip())
+        returncode, rss_kb = _wait_with_rusage(process)
+        for reader in readers:
+            reader.join()
+        if stats is not None:
+            stats["rss_kb"] = rss_kb
         
-        print(f"[OK] Completado en {duration:.1f}s")
-        return True
+        result = subprocess.CompletedProcess(command, returncode, ''.join(stdout_tail), ''.join(stderr_tail))
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, output=result.stdout, stderr=result.stderr)
         
     except subprocess.CalledProcessError as e:
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        print(f"[ERROR] FAILED después de {duration:.1f}s")
-        print(f"Exit Code: {e.returncode}")
-        
-        # Mostrar output estándar si existe
-        if e.stdout and e.stdout.strip():
-            print(f"\n>> Stdout:")
-            print(e.stdout.strip())
-        
-        # Mostrar errores detallados
-        if e.stderr and e.stderr.strip():
-            print(f"\n>> Error Details:")
-            print(e.stderr.strip())
-        
-        # Mostrar comando que falló para debug
-        print(f"\n>> Failed Command:")
-        print(f"   {' '.join(command)}")
-        
-        return False
+        error = e
     
     except Exception as e:
         print(f"[ERROR] Error inesperado: {str(e)}")
         print(f">> Command: {' '.join(command)}")
         return False
+    
+    finally:
+        # Reloj monotónico, medido en un único lugar para todos los casos
+        duration = time.perf_counter() - start_time
+        if stats is not None:
+            stats["duration_s"] = round(duration, 3)
+    
+    if error is None:
+        # Mostrar output si existe (para debug)
+        if result.stdout.strip():
+            print(result.stdout.strip())
+        
+        print(f"[OK] Completado en {duration:.1f}s")
+        return True
+    
+    print(f"[ERROR] FAILED después de {duration:.1f}s")
+    print(f"Exit Code: {error.returncode}")
+    
+    # Mostrar output estándar si existe
+    if error.stdout and error.stdout.strip():
+        print(f"\n>> Stdout:")
+        print(error.stdout.strip())
+    
+    # Mostrar errores detallados
+    if error.stderr and error.stderr.strip():
+        print(f"\n>> Error Details:")
+        print(error.stderr.strip())
+    
+    # Mostrar comando que falló para debug
+    print(f"\n>> Failed Command:")
+    print(f"   {' '.join(command)}")
+    
+    return False
+
+
+# Los pasos de procesamiento de video (y la sincronización, que lee clean_subtitles.srt) usan
+# archivos compartidos que no dependen del script_id. Con varios scripts en paralelo
+# (--script-ids) esos pasos se serializan con este lock.
+SHARED_MEDIA_LOCK = threading.Lock()
+
+
+def _run_step_command(step: dict, command: list, step_number: int, total_steps: int, stats: dict) -> bool:
+    """Ejecuta el comando de un paso, tomando SHARED_MEDIA_LOCK si usa archivos compartidos"""
+    with SHARED_MEDIA_LOCK if step.get("shared_media") else nullcontext():
+        return run_command_quiet(
+            command=command,
+            step_name=step["name"],
+            step_number=step_number,
+            total_steps=total_steps,
+            stats=stats
+        )
+
+
+def build_step_command(step: dict) -> list:
+    """Construye el comando completo de un paso (script + parámetros + opcionales)"""
+    command = [sys.executable, step["script"]] + step["params"]
+    
+    # Agregar parámetros opcionales
+    for optional_param in step["optional_params"]:
+        if optional_param:  # Solo si no es None
+            command.extend(optional_param)
+    
+    return command
+
+
+async def run_steps_dag(steps: list, completed_steps: set, checkpoint_manager: CheckpointManager,
+                        parameters: dict, max_parallel_steps: int = 2) -> list:
+    """
+    Ejecuta los pasos pendientes como un grafo de dependencias
+    
+    Cada paso arranca en cuanto todas sus dependencias terminan, con un máximo de
+    max_parallel_steps procesos simultáneos. Tras cada paso exitoso se guarda el
+    checkpoint con el conjunto de pasos completados. Si un paso falla no se lanzan
+    pasos nuevos, pero se espera a que terminen los que ya están corriendo.
+    
+    Returns:
+        list: [(número de paso, comando)] de los pasos que fallaron (vacía si todo OK)
+    """
+    total_steps = len(steps)
+    semaphore = asyncio.Semaphore(max(1, max_parallel_steps))
+    
+    # Tabla de dependencias pendientes y de pasos hijos
+    remaining_deps = {}
+    children = defaultdict(list)
+    for i, step in enumerate(steps, 1):
+        for dep in step["dependencies"]:
+            children[dep].append(i)
+        if i not in completed_steps:
+            remaining_deps[i] = sum(1 for dep in step["dependencies"] if dep not in completed_steps)
+    
+    shown_phases = set()
+    running = set()
+    failed_steps = []
+    
+    async def run_step(i: int):
+        step = steps[i - 1]
+        command = build_step_command(step)
+        stats = {}
+        async with semaphore:
+            # Mostrar encabezado la primera vez que arranca un paso de cada fase
+            if step["phase"] not in shown_phases:
+                shown_phases.add(step["phase"])
+                print(f"\n{'='*20} FASE: {step['phase']} {'='*20}")
+            success = await asyncio.to_thread(
+                _run_step_command,
+                step=step,
+                command=command,
+                step_number=i,
+                total_steps=total_steps,
+                stats=stats
+            )
+        return i, command, success, stats
+    
+    def launch(i: int):
+        running.add(asyncio.create_task(run_step(i)))
+    
+    for i, pending in remaining_deps.items():
+        if pending == 0:
+            launch(i)
+    
+    while running:
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            running.discard(task)
+            i, command, success, stats = task.result()
+            
+            if "duration_s" in stats:
+                checkpoint_manager.append_timing(
+                    step_number=i,
+                    step_name=steps[i - 1]["name"],
+                    duration=stats["duration_s"],
+                    rss_peak=stats.get("rss_kb"),
+                    success=success
+                )
+            
+            if not success:
+                failed_steps.append((i, command))
+                continue
+            
+            # Guardar checkpoint después de paso exitoso
+            completed_steps.add(i)
+            checkpoint_manager.save_checkpoint(
+                step_number=i,
+                step_name=steps[i - 1]["name"],
+                completed_steps=completed_steps,
+                parameters=parameters
+            )
+            
+            if failed_steps:
+                continue
+            
+            # Liberar los pasos que dependían de este
+            for child in children[i]:
+                if child in remaining_deps:
+                    remaining_deps[child] -= 1
+                    if remaining_deps[child] == 0:
+                        launch(child)
+    
+    return sorted(failed_steps)
 
 
 def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30, 
                      min_duration: int = None, max_duration: int = None, 
-                     force_restart: bool = False, skip_cleanup: bool = False, reset: bool = False) -> bool:
+                     force_restart: bool = False, skip_cleanup: bool = False, reset: bool = False,
+                     max_parallel_steps: int = 2) -> bool:
     """
     Ejecuta el pipeline completo de producción de video ejecutando directamente
     todos los scripts individuales con soporte para checkpoints
+    
+    Los pasos se ejecutan según sus dependencias: hasta max_parallel_steps pasos
+    independientes corren a la vez (p.ej. generación de contenido y Whisper)
     """
     
     # Crear manager de checkpoints
@@ -330,6 +617,7 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
     pipeline_start_time = time.time()
     
     # Definir todos los pasos del pipeline
+    # "dependencies" lista los pasos (numerados desde 1) cuyos archivos de salida usa cada paso
     steps = [
         # ============= FASE 1: GENERACIÓN DE CONTENIDO =============
         {
@@ -341,21 +629,24 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
                 ("--min-duration", str(min_duration)) if min_duration else None,
                 ("--max-duration", str(max_duration)) if max_duration else None
             ],
-            "phase": "CONTENIDO"
+            "phase": "CONTENIDO",
+            "dependencies": []
         },
         {
             "name": "Analizar Script y Generar Prompts de Video",
             "script": "content_02_analyze_scripts_video_prompts.py",
             "params": ["--script-id", str(script_id)],
             "optional_params": [],
-            "phase": "CONTENIDO"
+            "phase": "CONTENIDO",
+            "dependencies": [1]
         },
         {
             "name": "Generar Script HTML del Narrador",
             "script": "content_03_generate_narrator_scripts.py",
             "params": ["--script-id", str(script_id)],
             "optional_params": [],
-            "phase": "CONTENIDO"
+            "phase": "CONTENIDO",
+            "dependencies": [2]
         },
         
         # ============= FASE 2: PROCESAMIENTO DE VIDEO =============
@@ -364,21 +655,27 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
             "script": "pipeline_01_generate_transcription.py",
             "params": [],
             "optional_params": [],
-            "phase": "PROCESAMIENTO"
+            "phase": "PROCESAMIENTO",
+            "dependencies": [],
+            "shared_media": True
         },
         {
             "name": "Remover Silencios del Video",
             "script": "pipeline_02_cut_silence.py", 
             "params": [],
             "optional_params": [],
-            "phase": "PROCESAMIENTO"
+            "phase": "PROCESAMIENTO",
+            "dependencies": [4],
+            "shared_media": True
         },
         {
             "name": "Generar Subtítulos Finales Optimizados",
             "script": "pipeline_03_generate_subtitles.py",
             "params": [],
             "optional_params": [],
-            "phase": "PROCESAMIENTO"
+            "phase": "PROCESAMIENTO",
+            "dependencies": [5],
+            "shared_media": True
         },
         
         # ============= FASE 3: SINCRONIZACIÓN Y PROMPTS =============
@@ -387,14 +684,17 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
             "script": "pipeline_04_synchronize_script.py",
             "params": ["--script-id", str(script_id)],
             "optional_params": [],
-            "phase": "SINCRONIZACIÓN"
+            "phase": "SINCRONIZACIÓN",
+            "dependencies": [2, 6],
+            "shared_media": True
         },
         {
             "name": "Generar Prompts Segmentados",
             "script": "pipeline_05_generate_segmented_prompts.py",
             "params": ["--script-id", str(script_id)],
             "optional_params": [],
-            "phase": "SINCRONIZACIÓN"
+            "phase": "SINCRONIZACIÓN",
+            "dependencies": [7]
         },
         
         # ============= FASE 4: OBTENCIÓN DE VIDEOS =============
@@ -403,19 +703,25 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
             "script": "generate_search_keywords.py",
             "params": ["--script-id", str(script_id)],
             "optional_params": [],
-            "phase": "STOCK FOOTAGE"
+            "phase": "STOCK FOOTAGE",
+            "dependencies": [1]
         },
         {
             "name": "Buscar y Descargar Videos de Stock Footage",
             "script": "search_stock_footage.py",
-            "params": ["--script-id", str(script_id), "--max-videos", "50"],
+            "params": [
+                "--script-id", str(script_id),
+                "--keywords-file", f"VideoProduction/05_StockFootage/01_search_keywords/search_keywords_id_{script_id}.json",
+                "--max-videos", "50"
+            ],
             "optional_params": [],
-            "phase": "STOCK FOOTAGE"
+            "phase": "STOCK FOOTAGE",
+            "dependencies": [9]
         }
     ]
     
-    # Determinar desde qué paso empezar
-    start_step = 1
+    # Determinar qué pasos ya están completados
+    completed_steps = set()
     should_clean = True  # Por defecto, limpiar
     
     if reset:
@@ -427,10 +733,11 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
         # Verificar si hay checkpoint
         has_checkpoint = checkpoint_manager.show_checkpoint_status(len(steps))
         if has_checkpoint:
-            start_step = checkpoint_manager.get_resume_step()
+            completed_steps = checkpoint_manager.get_completed_steps()
             should_clean = False  # No limpiar si resumimos desde checkpoint
-            if start_step <= len(steps):
-                print(f"\n[INFO] Retomando desde paso {start_step}")
+            pending_steps = [i for i in range(1, len(steps) + 1) if i not in completed_steps]
+            if pending_steps:
+                print(f"\n[INFO] Retomando pasos pendientes: {', '.join(map(str, pending_steps))}")
             else:
                 print(f"\n[INFO] Pipeline ya completado según checkpoint")
                 checkpoint_manager.clear_checkpoint()
@@ -455,60 +762,39 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
         print(f"\n[INFO] Omitiendo limpieza de carpetas (--skip-cleanup)")
         print()
     
-    # Ejecutar cada paso
-    current_phase = None
-    for i, step in enumerate(steps, 1):
-        # Saltar pasos ya completados
-        if i < start_step:
-            continue
-        # Mostrar encabezado de fase si cambió
-        if step["phase"] != current_phase:
-            current_phase = step["phase"]
-            print(f"\n{'='*20} FASE: {current_phase} {'='*20}")
-        
-        # Construir comando completo
-        command = [sys.executable, step["script"]] + step["params"]
-        
-        # Agregar parámetros opcionales
-        for optional_param in step["optional_params"]:
-            if optional_param:  # Solo si no es None
-                command.extend(optional_param)
-        
-        # Ejecutar el paso
-        success = run_command_quiet(
-            command=command,
-            step_name=step["name"],
-            step_number=i,
-            total_steps=len(steps)
-        )
+    # Ejecutar los pasos pendientes respetando sus dependencias
+    failed_steps = asyncio.run(run_steps_dag(
+        steps=steps,
+        completed_steps=completed_steps,
+        checkpoint_manager=checkpoint_manager,
+        parameters=current_parameters,
+        max_parallel_steps=max_parallel_steps
+    ))
+    
+    if failed_steps:
+        pipeline_end_time = time.time()
+        total_duration = pipeline_end_time - pipeline_start_time
         
-        if success:
-            # Guardar checkpoint después de paso exitoso
-            checkpoint_manager.save_checkpoint(
-                step_number=i,
-                step_name=step["name"],
-                parameters=current_parameters
-            )
-        else:
-            pipeline_end_time = time.time()
-            total_duration = pipeline_end_time - pipeline_start_time
-            
-            print(f"\n" + "=" * 70)
-            print(f"[ERROR] PIPELINE FALLÓ EN PASO {i}")
-            print(f"=" * 70)
+        print(f"\n" + "=" * 70)
+        print(f"[ERROR] PIPELINE FALLÓ EN PASO {', '.join(str(i) for i, _ in failed_steps)}")
+        print(f"=" * 70)
+        for i, command in failed_steps:
+            step = steps[i - 1]
             print(f"Paso fallido: {step['name']}")
             print(f"Script: {step['script']}")
             print(f"Fase: {step['phase']}")
-            print(f"Tiempo transcurrido: {total_duration:.1f}s")
-            print(f"Script ID: {script_id}")
-            
-            print(f"\n>> Solución de problemas:")
-            print(f"   - Revisa la configuración en config.py")
-            print(f"   - Verifica que todos los archivos de entrada existan")
-            print(f"   - Ejecuta el script fallido individualmente:")
+        print(f"Pasos completados: {len(completed_steps)}/{len(steps)}")
+        print(f"Tiempo transcurrido: {total_duration:.1f}s")
+        print(f"Script ID: {script_id}")
+        
+        print(f"\n>> Solución de problemas:")
+        print(f"   - Revisa la configuración en config.py")
+        print(f"   - Verifica que todos los archivos de entrada existan")
+        print(f"   - Ejecuta el script fallido individualmente:")
+        for _, command in failed_steps:
             print(f"     {' '.join(command)}")
-            
-            return False
+        
+        return False
     
     # Pipeline completado exitosamente
     pipeline_end_time = time.time()
@@ -539,6 +825,58 @@ def run_main_pipeline(script_id: int, model: str = "wan", fps: int = 30,
     return True
 
 
+def run_multiple_pipelines(script_ids: list, max_parallel_scripts: int = 3, skip_cleanup: bool = False,
+                           reset: bool = False, force_restart: bool = False, **pipeline_kwargs) -> dict:
+    """
+    Ejecuta el pipeline completo para varios scripts, hasta max_parallel_scripts a la vez
+    
+    La limpieza se hace una sola vez al inicio preservando todos los IDs del lote (cada
+    pipeline por separado borraría los archivos de los demás). Los pasos que usan archivos
+    compartidos se serializan entre scripts mediante SHARED_MEDIA_LOCK.
+    
+    Returns:
+        dict: {script_id: True/False} con el resultado de cada pipeline
+    """
+    if reset:
+        print()
+        clean_project_directories(script_id=script_ids[0], clean_all=True)
+        print()
+    elif not skip_cleanup:
+        print()
+        clean_project_directories(script_id=script_ids[0], keep_script_ids=script_ids)
+        print()
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel_scripts)) as executor:
+        futures = {
+            executor.submit(
+                run_main_pipeline,
+                script_id=script_id,
+                force_restart=force_restart or reset,
+                skip_cleanup=True,
+                **pipeline_kwargs
+            ): script_id
+            for script_id in script_ids
+        }
+        for future in as_completed(futures):
+            script_id = futures[future]
+            try:
+                results[script_id] = future.result()
+            except Exception as e:
+                print(f"\n[ERROR] Script ID {script_id}: error inesperado: {str(e)}")
+                results[script_id] = False
+    
+    print(f"\n" + "=" * 70)
+    print(f">> RESUMEN DE LOTE ({len(script_ids)} scripts)")
+    print(f"=" * 70)
+    for script_id in script_ids:
+        status = "[OK]" if results[script_id] else "[ERROR]"
+        print(f"   {status} Script ID {script_id}")
+    print(f"Completados: {sum(results.values())}/{len(script_ids)}")
+    
+    return results
+
+
 def validate_prerequisites():
     """Valida que todos los scripts necesarios existan"""
     
@@ -560,10 +898,11 @@ def validate_prerequisites():
         "config.py"
     ]
     
-    missing_scripts = []
-    for script in required_scripts:
-        if not os.path.exists(script):
-            missing_scripts.append(script)
+    # Una sola lectura del directorio en lugar de un stat por script
+    with os.scandir('.') as entries:
+        present_files = {entry.name for entry in entries if entry.is_file()}
+    
+    missing_scripts = [script for script in required_scripts if script not in present_files]
     
     if missing_scripts:
         print(f"[ERROR] Scripts faltantes:")
@@ -604,6 +943,7 @@ def show_all_checkpoints():
             
             print(f"\nScript ID {script_id}:")
             print(f"  Último paso: {last_step} - {step_name}")
+            print(f"  Pasos completados: {', '.join(map(str, sorted(completed_steps_from_checkpoint(data))))}")
             print(f"  Fecha: {timestamp}")
             if parameters:
                 print(f"  Parámetros: {parameters}")
@@ -627,6 +967,8 @@ Ejemplos:
   python main.py --script-id 7 --force-restart
   python main.py --script-id 11 --skip-cleanup
   python main.py --script-id 17 --reset
+  python main.py --script-id 11 --max-parallel-steps 1
+  python main.py --script-ids 11 12 13 --max-parallel-scripts 2
   python main.py --show-checkpoints
 
 Requisitos:
@@ -650,6 +992,7 @@ SISTEMA DE LIMPIEZA:
 SISTEMA DE CHECKPOINTS:
 - Si el pipeline falla, automáticamente guarda el progreso
 - La próxima ejecución retomará desde donde se quedó
+- Los pasos independientes corren en paralelo; el checkpoint guarda el conjunto de pasos completados
 - Usa --force-restart para ignorar checkpoints y empezar desde cero
 - Los checkpoints se guardan en VideoProduction/00_checkpoints/
 
@@ -665,8 +1008,11 @@ Ejecuta directamente todos los scripts individuales sin capas intermedias.
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     
-    parser.add_argument('--script-id', type=int, required=True,
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--script-id', type=int,
                        help='ID del script a procesar (1-60)')
+    target.add_argument('--script-ids', type=int, nargs='+',
+                       help='Varios IDs de scripts a procesar en lote (ej: --script-ids 11 12 13)')
     parser.add_argument('--model', default='wan',
                        help='Modelo de IA para videos (default: wan)')
     parser.add_argument('--fps', type=int, default=30,
@@ -683,6 +1029,10 @@ Ejecuta directamente todos los scripts individuales sin capas intermedias.
                        help='RESETEA TODO: limpia todas las carpetas incluyendo archivos del script actual')
     parser.add_argument('--show-checkpoints', action='store_true',
                        help='Muestra todos los checkpoints existentes y sale')
+    parser.add_argument('--max-parallel-steps', type=int, default=2,
+                       help='Máximo de pasos independientes ejecutándose a la vez (default: 2, 1 = secuencial)')
+    parser.add_argument('--max-parallel-scripts', type=int, default=3,
+                       help='Con --script-ids: máximo de scripts procesándose a la vez (default: 3)')
     
     args = parser.parse_args()
     
@@ -691,11 +1041,16 @@ Ejecuta directamente todos los scripts individuales sin capas intermedias.
         show_all_checkpoints()
         return
     
+    if args.script_id is None and not args.script_ids:
+        parser.error("se requiere --script-id o --script-ids")
+    
     # Validar rango de script ID
-    if args.script_id < 1 or args.script_id > 60:
-        print(f"[ERROR] Script ID inválido: {args.script_id}")
-        print("Rango válido: 1-60")
-        sys.exit(1)
+    script_ids = list(dict.fromkeys(args.script_ids)) if args.script_ids else [args.script_id]
+    for script_id in script_ids:
+        if script_id < 1 or script_id > 60:
+            print(f"[ERROR] Script ID inválido: {script_id}")
+            print("Rango válido: 1-60")
+            sys.exit(1)
     
     # Validar prerequisites
     print(">> Verificando prerequisites...")
@@ -730,6 +1085,21 @@ Ejecuta directamente todos los scripts individuales sin capas intermedias.
     
     # Ejecutar pipeline completo
     try:
+        if args.script_ids:
+            results = run_multiple_pipelines(
+                script_ids=script_ids,
+                max_parallel_scripts=args.max_parallel_scripts,
+                skip_cleanup=args.skip_cleanup,
+                reset=args.reset,
+                force_restart=args.force_restart,
+                model=args.model,
+                fps=args.fps,
+                min_duration=args.min_duration,
+                max_duration=args.max_duration,
+                max_parallel_steps=args.max_parallel_steps
+            )
+            sys.exit(0 if all(results.values()) else 1)
+        
         success = run_main_pipeline(
             script_id=args.script_id,
             model=args.model,
@@ -738,7 +1108,8 @@ Ejecuta directamente todos los scripts individuales sin capas intermedias.
             max_duration=args.max_duration,
             force_restart=args.force_restart,
             skip_cleanup=args.skip_cleanup,
-            reset=args.reset
+            reset=args.reset,
+            max_parallel_steps=args.max_parallel_steps
         )
         
         if success:
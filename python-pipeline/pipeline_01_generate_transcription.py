@@ -5,13 +5,26 @@ Replica la calidad de transcripción de Adobe Premiere Pro
 """
 
 import os
-import glob
-import json
 import sys
+import argparse
+import torch
 import whisper
 from pathlib import Path
 from datetime import datetime
 from config import TranscriptionConfig, validate_all_paths, print_configuration_summary
+from json_utils import dump_json
+from audio_cache import load_audio_cached
+
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+try:
+    from faster_whisper import BatchedInferencePipeline  # faster-whisper >= 1.1
+except ImportError:
+    BatchedInferencePipeline = None
 
 def find_video_file(video_path):
     """
@@ -19,14 +32,17 @@ def find_video_file(video_path):
     Valida que hay exactamente un archivo MP4
     Renombra el archivo a 'video.mp4' para estandarizar el pipeline
     """
-    # Convertir ruta absoluta a relativa si es necesario
-    if not os.path.exists(video_path):
+    # Buscar archivos MP4 con un solo scandir (se ignoran los ocultos, igual que glob)
+    try:
+        with os.scandir(video_path) as entries:
+            mp4_files = [
+                entry.path for entry in entries
+                if entry.name.lower().endswith('.mp4') and not entry.name.startswith('.') and entry.is_file()
+            ]
+    except FileNotFoundError:
         print(f"[ERROR] Error: La ruta {video_path} no existe")
         return None
     
-    # Buscar archivos MP4
-    mp4_files = glob.glob(os.path.join(video_path, "*.mp4"))
-    
     if len(mp4_files) == 0:
         print(f"[ERROR] Error: No se encontraron archivos MP4 en {video_path}")
         return None
@@ -63,27 +79,104 @@ def find_video_file(video_path):
     
     return standard_video_file
 
+def use_faster_whisper():
+    """Indica si se usa el backend faster-whisper (configurado e instalado)"""
+    return TranscriptionConfig.WHISPER_BACKEND == "faster-whisper" and WhisperModel is not None
+
+def use_batched_inference():
+    """
+    Indica si faster-whisper transcribe por lotes: el VAD parte el audio en tramos
+    de voz de hasta 30s y se decodifican BATCH_SIZE tramos a la vez
+    """
+    return (use_faster_whisper() and BatchedInferencePipeline is not None
+            and TranscriptionConfig.VAD_FILTER and TranscriptionConfig.BATCH_SIZE > 0)
+
+def _faster_whisper_device():
+    """
+    Elige dispositivo y tipo de cómputo para faster-whisper:
+    int8_float16 en GPUs que lo soportan (Volta+), int8 en el resto y en CPU
+    """
+    if ctranslate2.get_cuda_device_count() > 0:
+        if "int8_float16" in ctranslate2.get_supported_compute_types("cuda"):
+            return "cuda", "int8_float16"
+        return "cuda", "int8"
+    return "cpu", "int8"
+
+def _load_model(model_size):
+    """Carga un modelo con el backend configurado"""
+    if use_faster_whisper():
+        device, compute_type = _faster_whisper_device()
+        print(f">> Backend: faster-whisper ({device}, {compute_type})")
+        model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                             download_root=TranscriptionConfig.MODEL_CACHE_DIR)
+        if use_batched_inference():
+            print(f">> Inferencia por lotes: {TranscriptionConfig.BATCH_SIZE} tramos de voz en paralelo")
+            return BatchedInferencePipeline(model=model)
+        return model
+    
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f">> Backend: openai-whisper ({device}, CUDA disponible: {torch.cuda.is_available()}, torch CUDA: {torch.version.cuda})")
+    if device == "cpu":
+        print(">> Sin GPU: para acelerar instala torch con CUDA: pip install torch --index-url https://download.pytorch.org/whl/cu121")
+    return whisper.load_model(model_size, device=device, download_root=TranscriptionConfig.MODEL_CACHE_DIR)
+
 def load_whisper_model(model_size=TranscriptionConfig.WHISPER_MODEL):
     """
     Carga el modelo Whisper
     """
     print(f">> Cargando modelo Whisper '{model_size}'...")
     try:
-        model = whisper.load_model(model_size)
+        model = _load_model(model_size)
         print("[OK] Modelo cargado exitosamente")
         return model
     except Exception as e:
         print(f"[ERROR] Error cargando modelo: {str(e)}")
         print(f">> Intentando con modelo '{TranscriptionConfig.FALLBACK_MODEL}' como respaldo...")
         try:
-            model = whisper.load_model(TranscriptionConfig.FALLBACK_MODEL)
+            model = _load_model(TranscriptionConfig.FALLBACK_MODEL)
             print(f"[OK] Modelo {TranscriptionConfig.FALLBACK_MODEL} cargado exitosamente")
             return model
         except Exception as e2:
             print(f"[ERROR] Error cargando modelo {TranscriptionConfig.FALLBACK_MODEL}: {str(e2)}")
             return None
 
-def generate_transcription(model, video_file):
+def _transcribe_faster_whisper(model, audio, transcribe_options):
+    """
+    Transcribe con faster-whisper y devuelve el mismo formato que whisper.transcribe
+    ({'text', 'segments', 'language'}) para que save_transcription no cambie
+    """
+    options = dict(transcribe_options)
+    verbose = options.pop('verbose')
+    if use_batched_inference():
+        options['batch_size'] = TranscriptionConfig.BATCH_SIZE
+        # El modo batched por defecto no genera timestamps: cada tramo de VAD (hasta 30s,
+        # con sus pausas) saldría como un único segmento y el SRT dejaría de marcar silencios
+        options['without_timestamps'] = False
+    segments, info = model.transcribe(audio, vad_filter=TranscriptionConfig.VAD_FILTER, **options)
+    
+    # Los segmentos se generan bajo demanda: la transcripción ocurre al recorrerlos
+    segment_list = []
+    for segment in segments:
+        if verbose:
+            print(f"[{format_time_srt(segment.start)} --> {format_time_srt(segment.end)}] {segment.text.strip()}")
+        segment_list.append({
+            'id': segment.id,
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text,
+            'words': [
+                {'word': word.word, 'start': word.start, 'end': word.end, 'probability': word.probability}
+                for word in (segment.words or [])
+            ]
+        })
+    
+    return {
+        'text': ''.join(segment['text'] for segment in segment_list),
+        'segments': segment_list,
+        'language': info.language
+    }
+
+def generate_transcription(model, video_file, audio_cache_path=TranscriptionConfig.AUDIO_CACHE_PATH):
     """
     Genera la transcripción usando Whisper
     """
@@ -94,19 +187,32 @@ def generate_transcription(model, video_file):
     if TranscriptionConfig.VERBOSE:
         print(f">> Configuración: Modelo={TranscriptionConfig.WHISPER_MODEL}, Idioma={TranscriptionConfig.LANGUAGE}, Temp={TranscriptionConfig.TEMPERATURE}")
     
+    # La alineación por palabra es trabajo extra: solo si el JSON o el SRT la usan
+    want_words = TranscriptionConfig.WORD_TIMESTAMPS and (
+        TranscriptionConfig.GENERATE_JSON or TranscriptionConfig.WORD_ALIGNED_SRT
+    )
+    
     try:
         # Transcribir con configuración desde config.py
         transcribe_options = {
             'language': TranscriptionConfig.LANGUAGE if TranscriptionConfig.LANGUAGE != 'auto' else None,
             'task': 'transcribe',
             'verbose': TranscriptionConfig.WHISPER_VERBOSE,
-            'word_timestamps': TranscriptionConfig.WORD_TIMESTAMPS,
+            'word_timestamps': want_words,
             'temperature': TranscriptionConfig.TEMPERATURE,
             'best_of': TranscriptionConfig.BEST_OF,
             'beam_size': TranscriptionConfig.BEAM_SIZE,
         }
         
-        result = model.transcribe(video_file, **transcribe_options)
+        # Ambos backends aceptan el array ya decodificado (sin volver a lanzar ffmpeg)
+        audio = load_audio_cached(video_file, audio_cache_path, whisper.load_audio)
+        
+        if use_faster_whisper():
+            result = _transcribe_faster_whisper(model, audio, transcribe_options)
+        else:
+            # fp16 solo en GPU (en CPU whisper avisa y vuelve a fp32)
+            transcribe_options['fp16'] = model.device.type == "cuda"
+            result = model.transcribe(audio, **transcribe_options)
         
         print("[OK] Transcripción completada exitosamente")
         return result
@@ -118,64 +224,64 @@ def save_transcription(result, video_file, output_dir):
     """
     Guarda la transcripción en múltiples formatos según configuración
     """
-    video_name = os.path.splitext(os.path.basename(video_file))[0]
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    video = Path(video_file)
+    output_dir = Path(output_dir)
     
     # Crear directorio de salida si no existe
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     saved_files = []
     
     # 1. Texto plano (.txt)
     if TranscriptionConfig.GENERATE_TXT:
-        txt_file = os.path.join(output_dir, f"{video_name}_transcription.txt")
+        txt_file = output_dir / f"{video.stem}_transcription.txt"
         with open(txt_file, 'w', encoding='utf-8') as f:
             f.write(result['text'])
         print(f"📄 Transcripción guardada: {txt_file}")
-        saved_files.append(txt_file)
+        saved_files.append(str(txt_file))
     
     # 2. JSON con timestamps (.json)
     if TranscriptionConfig.GENERATE_JSON:
-        json_file = os.path.join(output_dir, f"{video_name}_transcription_detailed.json")
+        json_file = output_dir / f"{video.stem}_transcription_detailed.json"
         transcription_data = {
-            'video_file': os.path.basename(video_file),
+            'video_file': video.name,
             'generated_at': datetime.now().isoformat(),
             'language': result.get('language', TranscriptionConfig.LANGUAGE),
             'duration': len(result.get('segments', [])),
             'full_text': result['text'],
-            'segments': []
+            # Segmentos con timestamps
+            'segments': [
+                {
+                    'id': segment.get('id'),
+                    'start': round(segment.get('start', 0), 2),
+                    'end': round(segment.get('end', 0), 2),
+                    'text': segment.get('text', '').strip(),
+                    'words': segment.get('words', [])
+                }
+                for segment in result.get('segments', [])
+            ]
         }
         
-        # Agregar segmentos con timestamps
-        for segment in result.get('segments', []):
-            transcription_data['segments'].append({
-                'id': segment.get('id'),
-                'start': round(segment.get('start', 0), 2),
-                'end': round(segment.get('end', 0), 2),
-                'text': segment.get('text', '').strip(),
-                'words': segment.get('words', []) if 'words' in segment else []
-            })
-        
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(transcription_data, f, ensure_ascii=False, indent=2)
+        dump_json(transcription_data, json_file)
         print(f"📋 Transcripción detallada guardada: {json_file}")
-        saved_files.append(json_file)
+        saved_files.append(str(json_file))
     
     # 3. Formato SRT para subtítulos (.srt)
     if TranscriptionConfig.GENERATE_SRT:
         # Nombre único para el pipeline
-        srt_file = os.path.join(output_dir, "original_transcription.srt")
+        srt_file = output_dir / "original_transcription.srt"
+        srt_blocks = []
+        for i, segment in enumerate(result.get('segments', []), 1):
+            start_time = format_time_srt(segment.get('start', 0))
+            end_time = format_time_srt(segment.get('end', 0))
+            text = segment.get('text', '').strip()
+            srt_blocks.append(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
+        
+        # Una sola escritura con todo el archivo
         with open(srt_file, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(result.get('segments', []), 1):
-                start_time = format_time_srt(segment.get('start', 0))
-                end_time = format_time_srt(segment.get('end', 0))
-                text = segment.get('text', '').strip()
-                
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n\n")
+            f.write(''.join(srt_blocks))
         print(f">> Subtítulos guardados: {srt_file}")
-        saved_files.append(srt_file)
+        saved_files.append(str(srt_file))
     
     return saved_files
 
@@ -183,12 +289,54 @@ def format_time_srt(seconds):
     """
     Convierte segundos a formato SRT (HH:MM:SS,mmm)
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}".replace('.', ',')
+    # Aritmética entera en milisegundos (redondear antes evita un "60,000" en los segundos)
+    hours, remainder = divmod(int(round(seconds * 1000)), 3600000)
+    minutes, remainder = divmod(remainder, 60000)
+    secs, millis = divmod(remainder, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+def main_batch(folder, output_dir=TranscriptionConfig.OUTPUT_DIRECTORY):
+    """
+    Transcribe todos los .mp4 de una carpeta cargando el modelo una sola vez
+    Cada video guarda sus archivos (y su audio decodificado) en output_dir/<nombre del video>/
+    """
+    video_files = sorted(Path(folder).glob('*.mp4'))
+    if not video_files:
+        print(f"[ERROR] Error: No se encontraron archivos MP4 en {folder}")
+        sys.exit(1)
+    
+    print(f">> Modo batch: {len(video_files)} videos en {folder}")
+    
+    model = load_whisper_model()
+    if not model:
+        sys.exit(1)
+    
+    failed = []
+    for index, video in enumerate(video_files, 1):
+        print(f"\n>> [{index}/{len(video_files)}] {video.name}")
+        video_output_dir = Path(output_dir) / video.stem
+        
+        result = generate_transcription(model, str(video), video_output_dir / "audio_16k.npy")
+        if not result:
+            failed.append(video.name)
+            continue
+        
+        save_transcription(result, str(video), str(video_output_dir))
+    
+    print("\n" + "=" * 50)
+    print(f"[OK] Transcritos: {len(video_files) - len(failed)}/{len(video_files)}")
+    if failed:
+        print(f"[ERROR] Fallaron: {', '.join(failed)}")
+        sys.exit(1)
 
 def main():
+    parser = argparse.ArgumentParser(description='Genera la transcripción SRT del video grabado con Whisper')
+    parser.add_argument('--batch-dir', type=str,
+                        help='Transcribe todos los .mp4 de esta carpeta con un solo modelo cargado')
+    parser.add_argument('--output-dir', type=str, default=str(TranscriptionConfig.OUTPUT_DIRECTORY),
+                        help='Carpeta de salida del modo batch (una subcarpeta por video)')
+    args = parser.parse_args()
+    
     print(">> GENERADOR DE TRANSCRIPCIONES DE ALTA CALIDAD")
     print("=" * 50)
     
@@ -206,6 +354,10 @@ def main():
         print_configuration_summary()
         print()
     
+    if args.batch_dir:
+        main_batch(args.batch_dir, args.output_dir)
+        return
+    
     # Configuración de rutas desde config.py
     video_input_path = TranscriptionConfig.VIDEO_INPUT_PATH  
     output_dir = TranscriptionConfig.OUTPUT_DIRECTORY
@@ -233,11 +385,11 @@ def main():
     print("\n" + "=" * 50)
     print("[OK] TRANSCRIPCIÓN COMPLETADA EXITOSAMENTE")
     print("=" * 50)
-    print(f">> Archivos generados en: {os.path.basename(output_dir)}/")
+    print(f">> Archivos generados en: {output_dir.name}/")
     
     # Mostrar archivos generados
     for file_path in saved_files:
-        file_name = os.path.basename(file_path)
+        file_name = Path(file_path).name
         if file_name.endswith('.txt'):
             print(f"📄 Texto plano: {file_name}")
         elif file_name.endswith('.json'):
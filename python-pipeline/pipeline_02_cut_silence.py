@@ -7,14 +7,35 @@ Incluye detección y manejo de rotación de video
 
 import os
 import sys
-import re
 import glob
 import subprocess
 import json
+import re
+import tempfile
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from pathlib import Path
+import numpy as np
 from moviepy.editor import VideoFileClip, concatenate_videoclips
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
 from config import SilenceCutConfig, validate_all_paths, print_configuration_summary
+from audio_cache import load_audio_cached
+
+try:
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+except ImportError:
+    get_speech_timestamps = None
+
+try:
+    import av
+    CUT_ERRORS = (subprocess.CalledProcessError, OSError, av.error.FFmpegError)
+except ImportError:
+    av = None
+    CUT_ERRORS = (subprocess.CalledProcessError, OSError)
+
+VAD_SAMPLING_RATE = 16000
 
 def get_video_rotation(video_path):
     """
@@ -187,6 +208,13 @@ def parse_srt_time(time_str):
     """
     Convierte tiempo SRT (HH:MM:SS,mmm) a segundos
     """
+    # Camino rápido: formato fijo de 12 caracteres, leído por posición en milisegundos enteros
+    if len(time_str) == 12 and time_str[2] == ':' and time_str[5] == ':' and time_str[8] == ',':
+        total_ms = (int(time_str[0:2]) * 3600000 + int(time_str[3:5]) * 60000
+                    + int(time_str[6:8]) * 1000 + int(time_str[9:12]))
+        return total_ms / 1000
+    
+    # Formato no estándar (p. ej. punto decimal o horas de un dígito)
     # Reemplazar coma por punto para milisegundos
     time_str = time_str.replace(',', '.')
     
@@ -199,52 +227,93 @@ def parse_srt_time(time_str):
     total_seconds = hours * 3600 + minutes * 60 + seconds
     return total_seconds
 
+def parse_srt_block(lines):
+    """
+    Convierte las líneas de un bloque SRT en un segmento {start, end, text}
+    Devuelve None si el bloque no es válido
+    """
+    if len(lines) < 3:
+        return None
+    
+    # Línea 1: número de subtítulo
+    # Línea 2: timestamps
+    # Línea 3+: texto
+    timestamp_line = lines[1]
+    if ' --> ' not in timestamp_line:
+        return None
+    
+    start_str, end_str = timestamp_line.split(' --> ', 1)
+    
+    try:
+        return {
+            'start': parse_srt_time(start_str.strip()),
+            'end': parse_srt_time(end_str.strip()),
+            'text': ' '.join(lines[2:]).strip()
+        }
+    except Exception as e:
+        if SilenceCutConfig.VERBOSE:
+            print(f"WARNING: Error parseando timestamp '{timestamp_line}': {e}")
+        return None
+
 def parse_srt_file(srt_path):
     """
     Parsea archivo SRT y extrae los timestamps
+    Recorre el archivo línea a línea; cada línea en blanco cierra un bloque
     """
     if not os.path.exists(srt_path):
         raise FileNotFoundError(f"Archivo SRT no encontrado: {srt_path}")
     
     segments = []
+    block = []
+    
+    with open(srt_path, 'r', encoding='utf-8', buffering=1 << 20) as file:
+        for line in file:
+            if line.strip():
+                block.append(line.rstrip('\r\n'))
+            elif block:
+                segment = parse_srt_block(block)
+                if segment:
+                    segments.append(segment)
+                block = []
+    
+    if block:
+        segment = parse_srt_block(block)
+        if segment:
+            segments.append(segment)
+    
+    # Whisper genera los bloques en orden; solo ordenar si el archivo viene desordenado
+    if any(segments[i]['start'] > segments[i + 1]['start'] for i in range(len(segments) - 1)):
+        segments.sort(key=lambda x: x['start'])
     
-    with open(srt_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    # Dividir por bloques de subtítulos
-    blocks = re.split(r'\n\s*\n', content.strip())
+    if SilenceCutConfig.VERBOSE:
+        print(f">> Parseados {len(segments)} segmentos del archivo SRT")
     
-    for block in blocks:
-        lines = block.strip().split('\n')
-        if len(lines) >= 3:
-            # Línea 1: número de subtítulo
-            # Línea 2: timestamps
-            # Línea 3+: texto
-            
-            timestamp_line = lines[1]
-            if ' --> ' in timestamp_line:
-                start_str, end_str = timestamp_line.split(' --> ')
-                
-                try:
-                    start_time = parse_srt_time(start_str.strip())
-                    end_time = parse_srt_time(end_str.strip())
-                    text = ' '.join(lines[2:]).strip()
-                    
-                    segments.append({
-                        'start': start_time,
-                        'end': end_time,
-                        'text': text
-                    })
-                except Exception as e:
-                    if SilenceCutConfig.VERBOSE:
-                        print(f"WARNING: Error parseando timestamp '{timestamp_line}': {e}")
-                    continue
+    return segments
+
+def detect_voice_vad(video_path):
+    """
+    Detecta los tramos con voz directamente sobre el audio con Silero VAD
+    Devuelve segmentos con el mismo formato que parse_srt_file (sin texto)
+    """
+    # Reutiliza el .npy que deja la transcripción solo si es de este mismo video
+    audio = load_audio_cached(
+        video_path, SilenceCutConfig.AUDIO_CACHE_PATH,
+        lambda path: decode_audio(path, sampling_rate=VAD_SAMPLING_RATE)
+    )
+    vad_options = VadOptions(
+        threshold=SilenceCutConfig.VAD_THRESHOLD,
+        min_silence_duration_ms=int(SilenceCutConfig.MIN_SILENCE_DURATION * 1000),
+        speech_pad_ms=0  # Los buffers se agregan en detect_speech_segments
+    )
+    timestamps = get_speech_timestamps(audio, vad_options, sampling_rate=VAD_SAMPLING_RATE)
     
-    # Ordenar por tiempo de inicio
-    segments.sort(key=lambda x: x['start'])
+    segments = [
+        {'start': ts['start'] / VAD_SAMPLING_RATE, 'end': ts['end'] / VAD_SAMPLING_RATE, 'text': ''}
+        for ts in timestamps
+    ]
     
     if SilenceCutConfig.VERBOSE:
-        print(f">> Parseados {len(segments)} segmentos del archivo SRT")
+        print(f">> VAD detectó {len(segments)} tramos con voz")
     
     return segments
 
@@ -256,38 +325,33 @@ def detect_speech_segments(srt_segments):
     if not srt_segments:
         return []
     
-    speech_segments = []
+    count = len(srt_segments)
+    starts = np.fromiter((seg['start'] for seg in srt_segments), dtype=np.float64, count=count)
+    ends = np.fromiter((seg['end'] for seg in srt_segments), dtype=np.float64, count=count)
     
-    for segment in srt_segments:
-        # Agregar buffers
-        start_with_buffer = max(0, segment['start'] - SilenceCutConfig.BUFFER_BEFORE)
-        end_with_buffer = segment['end'] + SilenceCutConfig.BUFFER_AFTER
-        
-        speech_segments.append({
-            'start': start_with_buffer,
-            'end': end_with_buffer,
-            'original_start': segment['start'],
-            'original_end': segment['end'],
-            'text': segment['text']
-        })
+    # Agregar buffers
+    starts_with_buffer = np.maximum(starts - SilenceCutConfig.BUFFER_BEFORE, 0)
+    ends_with_buffer = ends + SilenceCutConfig.BUFFER_AFTER
     
-    # Fusionar segmentos que se superponen o están muy cerca
-    merged_segments = []
-    current_segment = speech_segments[0].copy()
-    
-    for next_segment in speech_segments[1:]:
-        # Si hay superposición o gap muy pequeño, fusionar
-        if next_segment['start'] <= current_segment['end'] + 0.1:
-            # Fusionar
-            current_segment['end'] = max(current_segment['end'], next_segment['end'])
-            current_segment['text'] += ' | ' + next_segment['text']
-        else:
-            # Agregar el segmento actual y empezar uno nuevo
-            merged_segments.append(current_segment)
-            current_segment = next_segment.copy()
+    # Fusionar segmentos que se superponen o están muy cerca:
+    # un segmento empieza un grupo nuevo si inicia después del final acumulado + 0.1s
+    running_end = np.maximum.accumulate(ends_with_buffer)
+    new_group = starts_with_buffer[1:] > running_end[:-1] + 0.1
+    leaders = np.concatenate(([0], np.flatnonzero(new_group) + 1))
     
-    # Agregar el último segmento
-    merged_segments.append(current_segment)
+    merged_starts = np.minimum.reduceat(starts_with_buffer, leaders).tolist()
+    merged_ends = np.maximum.reduceat(ends_with_buffer, leaders).tolist()
+    bounds = leaders.tolist() + [count]
+    
+    merged_segments = []
+    for i, leader in enumerate(bounds[:-1]):
+        merged_segments.append({
+            'start': merged_starts[i],
+            'end': merged_ends[i],
+            'original_start': srt_segments[leader]['start'],
+            'original_end': srt_segments[leader]['end'],
+            'text': ' | '.join(seg['text'] for seg in srt_segments[leader:bounds[i + 1]])
+        })
     
     if SilenceCutConfig.VERBOSE:
         print(f">> Detectados {len(merged_segments)} segmentos de habla (después de fusionar)")
@@ -376,8 +440,8 @@ def cut_video_segments(video_path, speech_segments, output_path):
     if SilenceCutConfig.VERBOSE:
         print(f">> Concatenando {len(clips)} clips...")
     
-    # Concatenar clips
-    final_video = concatenate_videoclips(clips, method="compose")
+    # Concatenar clips: todos salen del mismo video (mismo tamaño), no hace falta "compose"
+    final_video = concatenate_videoclips(clips, method="chain")
     
     # Crear directorio de salida
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -421,6 +485,256 @@ def cut_video_segments(video_path, speech_segments, output_path):
         'final_resolution': final_video.size
     }
 
+def run_ffmpeg(args):
+    """
+    Ejecuta ffmpeg (el mismo binario que usa MoviePy) y lanza CalledProcessError si falla
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), '-hide_banner', '-loglevel', 'error', '-y', *args]
+    subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+def get_keyframe_times(video_path):
+    """
+    Tiempos (en segundos) de los keyframes del video
+    ffmpeg decodifica solo los keyframes (-skip_frame nokey) y showinfo imprime su pts_time
+    """
+    cmd = [
+        get_setting("FFMPEG_BINARY"), '-hide_banner', '-nostats',
+        '-skip_frame', 'nokey', '-i', video_path,
+        '-map', '0:v:0', '-vf', 'showinfo', '-f', 'null', '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return sorted(float(t) for t in re.findall(r'pts_time:\s*(-?[\d.]+)', result.stderr))
+
+def merge_segments_at_keyframes(segments, keyframe_times):
+    """
+    Con stream copy cada segmento empieza en el keyframe anterior a su inicio. Si ese keyframe
+    cae antes del final del segmento anterior, los dos se unen en un solo tramo continuo:
+    cortarlos por separado repetiría lo que hay entre el keyframe y ese final
+    """
+    merged = []
+    for start_time, end_time in segments:
+        index = bisect_right(keyframe_times, start_time) - 1
+        keyframe_time = keyframe_times[index] if index >= 0 else 0.0
+        if merged and keyframe_time < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end_time))
+        else:
+            merged.append((start_time, end_time))
+    return merged
+
+def concat_segments_ffmpeg(video_path, segments, output_path, stream_copy=True):
+    """
+    Extrae cada segmento (start, end) a un archivo temporal con ffmpeg
+    y los une con el concat demuxer (-c copy)
+    """
+    if stream_copy:
+        codec_args = ['-c', 'copy', '-avoid_negative_ts', 'make_zero']
+    else:
+        codec_args = [
+            '-c:v', SilenceCutConfig.VIDEO_CODEC,
+            '-crf', str(SilenceCutConfig.CRF_VALUE),
+            '-preset', SilenceCutConfig.PRESET,
+            '-c:a', SilenceCutConfig.AUDIO_CODEC
+        ]
+    
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(output_path)) as temp_dir:
+        list_lines = []
+        
+        for i, (start_time, end_time) in enumerate(segments):
+            part_path = os.path.join(temp_dir, f"part_{i:05d}.mp4")
+            run_ffmpeg([
+                '-ss', f"{start_time:.3f}", '-i', video_path,
+                '-t', f"{end_time - start_time:.3f}",
+                '-map', '0:v:0', '-map', '0:a:0?',
+                *codec_args, part_path
+            ])
+            list_lines.append(f"file '{part_path}'\n")
+        
+        list_path = os.path.join(temp_dir, "segments.txt")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.writelines(list_lines)
+        
+        run_ffmpeg([
+            '-f', 'concat', '-safe', '0', '-i', list_path,
+            '-c', 'copy', '-movflags', '+faststart', output_path
+        ])
+
+def remux_segments_pyav(video_path, segments, output_path):
+    """
+    Copia los paquetes de cada segmento (start, end) a un solo MP4 con PyAV, sin decodificar
+    Cada segmento empieza en el keyframe anterior a su inicio y termina en el primer
+    paquete (en orden de decodificación) que llega a su final. Los timestamps se desplazan
+    para que cada segmento continúe donde terminó el anterior. Si el keyframe ya se copió
+    con el segmento anterior, ambos forman un único tramo continuo (nada se repite)
+    """
+    with av.open(video_path) as source, av.open(output_path, 'w', options={'movflags': '+faststart'}) as target:
+        video_in = source.streams.video[0]
+        streams_in = [video_in] + list(source.streams.audio[:1])
+        if hasattr(target, 'add_stream_from_template'):  # PyAV >= 13
+            streams_out = {stream.index: target.add_stream_from_template(stream) for stream in streams_in}
+        else:
+            streams_out = {stream.index: target.add_stream(template=stream) for stream in streams_in}
+        
+        # Final (en segundos del video de salida) de lo ya escrito, en orden de presentación y de decodificación
+        pts_end = dts_end = 0.0
+        # Último dts (en segundos del video original) copiado de cada stream y desplazamiento usado
+        last_dts = {}
+        last_shift = None
+        
+        for start_time, end_time in segments:
+            source.seek(int(start_time / video_in.time_base), stream=video_in)
+            shift = None
+            continuing = False
+            finished = set()
+            
+            for packet in source.demux(*streams_in):
+                if packet.dts is None:
+                    continue  # Paquete vacío de fin de archivo
+                
+                time_base = packet.time_base
+                dts_time = float(packet.dts * time_base)
+                
+                if shift is None:
+                    # El segmento empieza en el keyframe de video donde quedó el seek
+                    if packet.stream is not video_in:
+                        continue
+                    continuing = dts_time <= last_dts.get(video_in.index, float('-inf'))
+                    if continuing:
+                        # El keyframe es anterior al final del segmento previo: se sigue el mismo tramo
+                        shift = last_shift
+                    else:
+                        shift = max(pts_end - float(packet.pts * time_base), dts_end - dts_time)
+                    segment_pts_end, segment_dts_end = pts_end, dts_end
+                
+                if packet.stream.index in finished or dts_time <= last_dts.get(packet.stream.index, float('-inf')):
+                    continue  # Ya copiado con el segmento anterior
+                
+                if not continuing and dts_time + shift < dts_end:
+                    continue
+                
+                if dts_time >= end_time:
+                    finished.add(packet.stream.index)
+                    if len(finished) == len(streams_in):
+                        break
+                    continue
+                
+                last_dts[packet.stream.index] = dts_time
+                ticks = round(shift / time_base)
+                packet.dts += ticks
+                packet.pts += ticks
+                duration = packet.duration or 0
+                segment_pts_end = max(segment_pts_end, float((packet.pts + duration) * time_base))
+                segment_dts_end = max(segment_dts_end, float((packet.dts + duration) * time_base))
+                
+                packet.stream = streams_out[packet.stream.index]
+                target.mux(packet)
+            
+            if shift is not None:
+                pts_end, dts_end = segment_pts_end, segment_dts_end
+                last_shift = shift
+
+def cut_video_segments_ffmpeg(video_path, speech_segments, output_path, stream_copy=True):
+    """
+    Corta el video manteniendo solo los segmentos con habla sin pasar los frames por Python
+    
+    Con stream_copy=True no se re-codifica nada: los paquetes se copian tal cual con PyAV
+    (o con ffmpeg si PyAV no está instalado). Los cortes se alinean al keyframe anterior
+    a cada inicio, así que un segmento puede empezar hasta un GOP antes de lo pedido; si ese
+    keyframe cae dentro del segmento anterior, ambos se copian como un único tramo continuo.
+    Con stream_copy=False cada segmento se re-codifica con ffmpeg usando CRF/preset de la
+    configuración (cortes exactos). En ambos casos la rotación se mantiene: con copy se
+    conserva el metadata y al re-codificar ffmpeg aplica la rotación a los frames.
+    """
+    rotation_info = get_video_rotation(video_path)
+    
+    if stream_copy:
+        method_name = "stream copy (PyAV)" if av is not None else "stream copy (ffmpeg)"
+    else:
+        method_name = "re-codificación por segmento (ffmpeg)"
+    
+    if SilenceCutConfig.VERBOSE:
+        print(f">> Rotación detectada: {rotation_info['rotation']}°")
+        print(f">> Método de corte: {method_name}")
+    
+    original_duration = ffmpeg_parse_infos(video_path)['duration']
+    
+    if SilenceCutConfig.VERBOSE:
+        print(f">> Duración original: {original_duration:.2f} segundos")
+    
+    segments = []
+    
+    for i, segment in enumerate(speech_segments):
+        start_time = segment['start']
+        end_time = min(segment['end'], original_duration)
+        
+        if start_time >= original_duration:
+            if SilenceCutConfig.VERBOSE:
+                print(f"WARNING: Segmento {i+1} excede duración del video, omitiendo")
+            continue
+        
+        if end_time <= start_time:
+            if SilenceCutConfig.VERBOSE:
+                print(f"WARNING: Segmento {i+1} tiene duración inválida, omitiendo")
+            continue
+        
+        if SilenceCutConfig.VERBOSE:
+            print(f">> Cortando segmento {i+1}: {start_time:.2f}s - {end_time:.2f}s ({end_time-start_time:.2f}s)")
+        
+        segments.append((start_time, end_time))
+    
+    if not segments:
+        raise ValueError("No se pudieron crear clips válidos")
+    
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    if SilenceCutConfig.VERBOSE:
+        print(f">> Concatenando {len(segments)} clips...")
+        print(f">> Ruta de salida: {output_path}")
+    
+    if stream_copy and av is not None:
+        remux_segments_pyav(video_path, segments, output_path)
+    else:
+        if stream_copy:
+            cut_count = len(segments)
+            segments = merge_segments_at_keyframes(segments, get_keyframe_times(video_path))
+            if SilenceCutConfig.VERBOSE and len(segments) < cut_count:
+                print(f">> {cut_count - len(segments)} segmentos unidos al anterior por compartir keyframe")
+        concat_segments_ffmpeg(video_path, segments, output_path, stream_copy)
+    
+    # Calcular estadísticas (con stream copy los cortes no son exactos: se mide el archivo final)
+    output_info = ffmpeg_parse_infos(output_path)
+    final_duration = output_info['duration']
+    time_saved = original_duration - final_duration
+    percentage_saved = (time_saved / original_duration) * 100 if original_duration > 0 else 0
+    
+    return {
+        'original_duration': original_duration,
+        'final_duration': final_duration,
+        'time_saved': time_saved,
+        'percentage_saved': percentage_saved,
+        'rotation_applied': rotation_info['rotation'] if rotation_info['needs_rotation'] and not stream_copy else 0,
+        'final_resolution': tuple(output_info['video_size'])
+    }
+
+def cut_video(video_path, speech_segments, output_path):
+    """
+    Corta el video con el método configurado en SilenceCutConfig.CUT_METHOD
+    Si ffmpeg falla se vuelve al método original con MoviePy
+    """
+    method = SilenceCutConfig.CUT_METHOD
+    
+    if method in ("copy", "reencode"):
+        try:
+            return cut_video_segments_ffmpeg(
+                video_path, speech_segments, output_path,
+                stream_copy=(method == "copy")
+            )
+        except CUT_ERRORS as e:
+            stderr = getattr(e, 'stderr', None)
+            print(f"WARNING: Error cortando con ffmpeg/PyAV: {stderr.strip() if stderr else e}")
+            print(">> Usando MoviePy como alternativa...")
+    
+    return cut_video_segments(video_path, speech_segments, output_path)
+
 def main():
     print(">> CORTADOR DE SILENCIOS BASADO EN SRT")
     print("=" * 50)
@@ -447,15 +761,27 @@ def main():
             print("[ERROR] No se encontró ningún archivo MP4")
             sys.exit(1)
         
-        # Paso 1: Parsear archivo SRT
-        print(">> Paso 1: Parseando archivo SRT...")
-        srt_path = SilenceCutConfig.SRT_INPUT_PATH
-        print(f">> Usando archivo SRT: {srt_path}")
-        srt_segments = parse_srt_file(str(srt_path))
+        if SilenceCutConfig.USE_VAD and get_speech_timestamps is None:
+            print("WARNING: USE_VAD requiere faster-whisper (pip install faster-whisper), usando el SRT")
         
-        if not srt_segments:
-            print("[ERROR] No se encontraron segmentos válidos en el archivo SRT")
-            sys.exit(1)
+        if SilenceCutConfig.USE_VAD and get_speech_timestamps is not None:
+            # Paso 1: Detectar voz en el audio (sin pasar por el SRT)
+            print(">> Paso 1: Detectando voz en el audio (VAD)...")
+            srt_segments = detect_voice_vad(video_file)
+            
+            if not srt_segments:
+                print("[ERROR] El VAD no detectó voz en el audio")
+                sys.exit(1)
+        else:
+            # Paso 1: Parsear archivo SRT
+            print(">> Paso 1: Parseando archivo SRT...")
+            srt_path = SilenceCutConfig.SRT_INPUT_PATH
+            print(f">> Usando archivo SRT: {srt_path}")
+            srt_segments = parse_srt_file(str(srt_path))
+            
+            if not srt_segments:
+                print("[ERROR] No se encontraron segmentos válidos en el archivo SRT")
+                sys.exit(1)
         
         # Paso 2: Detectar segmentos de habla
         print(">> Paso 2: Detectando segmentos de habla...")
@@ -471,7 +797,7 @@ def main():
         output_filename = "video_no_silence.mp4"
         output_path = str(SilenceCutConfig.OUTPUT_DIRECTORY / output_filename)
         
-        result = cut_video_segments(video_file, speech_segments, output_path)
+        result = cut_video(video_file, speech_segments, output_path)
         
         print("\n" + "=" * 50)
         print("[OK] PROCESO COMPLETADO EXITOSAMENTE")
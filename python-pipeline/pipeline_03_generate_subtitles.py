@@ -5,7 +5,6 @@ Optimizado específicamente para la creación de archivos de subtítulos
 """
 
 import os
-import glob
 import sys
 import whisper
 import textwrap
@@ -18,14 +17,17 @@ def find_video_file(video_path):
     Busca archivos MP4 en la ruta especificada
     Valida que hay exactamente un archivo MP4
     """
-    # Convertir ruta absoluta a relativa si es necesario
-    if not os.path.exists(video_path):
+    # Buscar archivos MP4 con un solo scandir (se ignoran los ocultos, igual que glob)
+    try:
+        with os.scandir(video_path) as entries:
+            mp4_files = [
+                entry.path for entry in entries
+                if entry.name.lower().endswith('.mp4') and not entry.name.startswith('.') and entry.is_file()
+            ]
+    except FileNotFoundError:
         print(f"[ERROR] Error: La ruta {video_path} no existe")
         return None
     
-    # Buscar archivos MP4
-    mp4_files = glob.glob(os.path.join(video_path, "*.mp4"))
-    
     if len(mp4_files) == 0:
         print(f"[ERROR] Error: No se encontraron archivos MP4 en {video_path}")
         return None
@@ -47,14 +49,14 @@ def load_whisper_model(model_size=SubtitlesConfig.WHISPER_MODEL):
     """
     print(f">> Cargando modelo Whisper '{model_size}'...")
     try:
-        model = whisper.load_model(model_size)
+        model = whisper.load_model(model_size, download_root=SubtitlesConfig.MODEL_CACHE_DIR)
         print("[OK] Modelo cargado exitosamente")
         return model
     except Exception as e:
         print(f"[ERROR] Error cargando modelo: {str(e)}")
         print(f">> Intentando con modelo '{SubtitlesConfig.FALLBACK_MODEL}' como respaldo...")
         try:
-            model = whisper.load_model(SubtitlesConfig.FALLBACK_MODEL)
+            model = whisper.load_model(SubtitlesConfig.FALLBACK_MODEL, download_root=SubtitlesConfig.MODEL_CACHE_DIR)
             print(f"[OK] Modelo {SubtitlesConfig.FALLBACK_MODEL} cargado exitosamente")
             return model
         except Exception as e2:
@@ -10,9 +10,19 @@ import json
 import re
 import difflib
 import argparse
+import numpy as np
 from datetime import datetime
 from config import SynchronizationConfig, validate_all_paths, print_configuration_summary
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+
+# Patrones compilados una sola vez
+SRT_BLOCK_SEPARATOR = re.compile(r'\n\s*\n')
+NON_WORD_CHARS = re.compile(r'[^\w\s]')
+
 def parse_srt_time(time_str):
     """
     Convierte tiempo SRT (HH:MM:SS,mmm) a segundos
@@ -37,7 +47,7 @@ def parse_srt_file(srt_path):
         content = file.read()
     
     # Dividir por bloques de subtítulos
-    blocks = re.split(r'\n\s*\n', content.strip())
+    blocks = SRT_BLOCK_SEPARATOR.split(content.strip())
     
     for block in blocks:
         lines = block.strip().split('\n')
@@ -96,21 +106,24 @@ def clean_text_for_comparison(text):
     """
     # Convertir a minúsculas
     text = text.lower()
-    # Remover emojis y caracteres especiales
-    text = re.sub(r'[^\w\s]', '', text)
-    # Remover puntuación
-    text = re.sub(r'[^\w\s]', ' ', text)
+    # Remover emojis, caracteres especiales y puntuación
+    text = NON_WORD_CHARS.sub('', text)
     # Normalizar espacios
     text = ' '.join(text.split())
     return text
 
 def calculate_text_similarity(text1, text2):
     """
-    Calcula la similitud entre dos textos usando difflib
+    Calcula la similitud entre dos textos (0-1)
+    Usa RapidFuzz (implementado en C++) si está instalado y difflib si no
     """
     clean_text1 = clean_text_for_comparison(text1)
     clean_text2 = clean_text_for_comparison(text2)
     
+    if fuzz is not None:
+        # Similitud Indel normalizada: 2 * LCS / (len1 + len2)
+        return fuzz.ratio(clean_text1, clean_text2) / 100.0
+    
     # Usar SequenceMatcher para calcular similitud
     similarity = difflib.SequenceMatcher(None, clean_text1, clean_text2).ratio()
     return similarity
@@ -118,30 +131,44 @@ def calculate_text_similarity(text1, text2):
 def synchronize_by_similarity(script_phrases, srt_segments):
     """
     Sincroniza frases usando similitud de texto
+    Cada frase (en orden) toma el segmento libre más parecido que supere el umbral
     """
     synchronized_phrases = []
-    used_segments = set()
     
-    for phrase in script_phrases:
+    # Limpiar cada texto una sola vez
+    clean_phrases = [clean_text_for_comparison(phrase['phrase']) for phrase in script_phrases]
+    clean_segments = [clean_text_for_comparison(segment['text']) for segment in srt_segments]
+    available = np.ones(len(srt_segments), dtype=bool)
+    
+    if fuzz is not None:
+        # Matriz completa (frases x segmentos) calculada en C++ usando todos los núcleos
+        similarity_matrix = process.cdist(clean_phrases, clean_segments, scorer=fuzz.ratio,
+                                          dtype=np.float64, workers=-1) / 100.0
+    
+    for i, phrase in enumerate(script_phrases):
         phrase_text = phrase['phrase']
         best_match = None
         best_similarity = 0
-        best_segment_idx = -1
         
-        for i, segment in enumerate(srt_segments):
-            if i in used_segments:
-                continue
-                
-            similarity = calculate_text_similarity(phrase_text, segment['text'])
+        if fuzz is not None:
+            similarity = np.where(available, similarity_matrix[i], -1.0)
+        else:
+            # Sin RapidFuzz: difflib solo contra los segmentos libres
+            similarity = np.full(len(srt_segments), -1.0)
+            for j in np.flatnonzero(available):
+                similarity[j] = difflib.SequenceMatcher(None, clean_phrases[i], clean_segments[j]).ratio()
+        
+        if srt_segments:
+            # argmax devuelve el primer máximo: mismo desempate que recorrer los segmentos en orden
+            best_segment_idx = int(similarity.argmax())
+            candidate_similarity = float(similarity[best_segment_idx])
             
-            if similarity > best_similarity and similarity >= SynchronizationConfig.SIMILARITY_THRESHOLD:
-                best_similarity = similarity
-                best_match = segment
-                best_segment_idx = i
+            if candidate_similarity > 0 and candidate_similarity >= SynchronizationConfig.SIMILARITY_THRESHOLD:
+                best_similarity = candidate_similarity
+                best_match = srt_segments[best_segment_idx]
+                available[best_segment_idx] = False
         
         if best_match:
-            used_segments.add(best_segment_idx)
-            
             # Agregar timing information
             phrase_with_timing = phrase.copy()
             phrase_with_timing['timing'] = {
@@ -26,8 +26,9 @@ load_dotenv()
 class PexelsAPI:
     """Cliente para Pexels Videos API"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        self.session = session or requests.Session()
         self.base_url = "https://api.pexels.com/videos/search"
         self.headers = {"Authorization": api_key}
         self.rate_limit_delay = 1  # 1 segundo entre requests
@@ -42,7 +43,7 @@ class PexelsAPI:
         
         try:
             print(f"    [PEXELS] Searching: \"{query}\"...")
-            response = requests.get(self.base_url, headers=self.headers, params=params)
+            response = self.session.get(self.base_url, headers=self.headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -61,7 +62,7 @@ class PexelsAPI:
         """Descarga un video desde Pexels"""
         try:
             # Hacer request con stream para verificar size
-            response = requests.get(video_url, stream=True)
+            response = self.session.get(video_url, stream=True)
             response.raise_for_status()
             
             # Verificar tamaño del archivo
@@ -70,6 +71,7 @@ class PexelsAPI:
                 size_mb = int(content_length) / (1024 * 1024)
                 if size_mb > max_size_mb:
                     print(f"        [SKIP] Video too large: {size_mb:.1f}MB")
+                    response.close()  # Devolver la conexión a la sesión sin descargar el cuerpo
                     return False
             
             # Descargar archivo
@@ -88,8 +90,9 @@ class PexelsAPI:
 class PixabayAPI:
     """Cliente para Pixabay Videos API"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        self.session = session or requests.Session()
         self.base_url = "https://pixabay.com/api/videos/"
         self.rate_limit_delay = 1  # 1 segundo entre requests  
     
@@ -105,7 +108,7 @@ class PixabayAPI:
         
         try:
             print(f"    [PIXABAY] Searching: \"{query}\"...")
-            response = requests.get(self.base_url, params=params)
+            response = self.session.get(self.base_url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -123,7 +126,7 @@ class PixabayAPI:
     def download_video(self, video_url: str, output_path: str, max_size_mb: int = 50) -> bool:
         """Descarga un video desde Pixabay"""
         try:
-            response = requests.get(video_url, stream=True)
+            response = self.session.get(video_url, stream=True)
             response.raise_for_status()
             
             # Verificar tamaño si está disponible
@@ -132,6 +135,7 @@ class PixabayAPI:
                 size_mb = int(content_length) / (1024 * 1024)
                 if size_mb > max_size_mb:
                     print(f"        [SKIP] Video too large: {size_mb:.1f}MB")
+                    response.close()  # Devolver la conexión a la sesión sin descargar el cuerpo
                     return False
             
             with open(output_path, 'wb') as f:
@@ -171,6 +175,8 @@ def search_and_download_videos(
     if keywords_file is None:
         keywords_dir = Path("VideoProduction/05_StockFootage/01_search_keywords")
         keywords_file = keywords_dir / f"search_keywords_id_{script_id}.json"
+    else:
+        keywords_file = Path(keywords_file)
     
     print(f">> STOCK FOOTAGE SEARCH - SCRIPT ID {script_id}")
     print("=" * 60)
@@ -209,19 +215,22 @@ def search_and_download_videos(
     pixabay_dir.mkdir(parents=True, exist_ok=True)
     
     # Inicializar APIs
+    # Una sola sesión HTTP para todas las búsquedas y descargas: reutiliza conexiones
+    # keep-alive en lugar de abrir un TCP/TLS nuevo por request
+    session = requests.Session()
     apis_available = []
     pexels_client = None
     pixabay_client = None
     
     if pexels_api_key:
-        pexels_client = PexelsAPI(pexels_api_key)
+        pexels_client = PexelsAPI(pexels_api_key, session=session)
         apis_available.append("pexels")
         print(f"[OK] Pexels API initialized")
     else:
         print(f"[WARNING] No Pexels API key provided")
     
     if pixabay_api_key:
-        pixabay_client = PixabayAPI(pixabay_api_key)
+        pixabay_client = PixabayAPI(pixabay_api_key, session=session)
         apis_available.append("pixabay")
         print(f"[OK] Pixabay API initialized")
     else: